@@ -50,6 +50,12 @@ class Settings(BaseModel):
     gemini_live_model: str = "gemini-live-2.5-flash-preview"
     gemini_image_model: str = "gemini-2.5-flash-image-preview"
     
+    # Maximum Gemini generate calls in flight per process; tune to the project quota
+    gemini_max_concurrency: int = 16
+    
+    # Attempts per Gemini generate call when the API reports rate limiting or a server error
+    gemini_max_attempts: int = 3
+    
     # Crisis Detection Keywords (in multiple Indian languages)
     crisis_keywords: list[str] = [
         # English
@@ -106,6 +112,8 @@ class Settings(BaseModel):
         self.firebase_storage_bucket = os.getenv("FIREBASE_STORAGE_BUCKET")
         self.debug = os.getenv("DEBUG", "false").lower() == "true"
         self.environment = os.getenv("ENVIRONMENT", "development")
+        self.gemini_max_concurrency = int(os.getenv("GEMINI_MAX_CONCURRENCY", self.gemini_max_concurrency))
+        self.gemini_max_attempts = max(1, int(os.getenv("GEMINI_MAX_ATTEMPTS", self.gemini_max_attempts)))
         
         # Port from environment
         port_env = os.getenv("PORT")
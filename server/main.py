@@ -8,11 +8,13 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import uvicorn
 
 from core.config import settings
 from routers import chat, wellness, user, voice
+from services.firebase_service import keep_firebase_certs_fresh, get_firebase_service
 
 
 # Configure logging
@@ -40,12 +42,19 @@ async def lifespan(app: FastAPI):
         logger.error("FIREBASE_PROJECT_ID environment variable is required")
         raise RuntimeError("Missing FIREBASE_PROJECT_ID")
     
+    # Preload and periodically refresh the ID token certificates
+    certs_task = asyncio.create_task(keep_firebase_certs_fresh())
+    # Warm Firestore and Auth connections in the background so startup is not delayed
+    warmup_task = asyncio.create_task(get_firebase_service().warm_up())
+    
     logger.info("Server startup complete")
     
     yield
     
     # Shutdown
     logger.info("Shutting down Mitra AI server...")
+    certs_task.cancel()
+    warmup_task.cancel()
 
 
 # Create FastAPI application
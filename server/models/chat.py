@@ -47,6 +47,7 @@ class MessageContent(BaseModel):
     text: Optional[str] = None
     audio_data: Optional[bytes] = None
     image_data: Optional[bytes] = None
+    image_mime_type: Optional[str] = None
     structured_data: Optional[Dict[str, Any]] = None
     html_content: Optional[str] = None
 
@@ -114,6 +115,7 @@ class MultimodalChatRequest(BaseModel):
     """Request for multimodal chat (text + image)."""
     text: Optional[str] = None
     image_data: Optional[bytes] = None
+    image_mime_type: Optional[str] = None
     session_id: Optional[str] = None
     operation: str = Field(default="describe", pattern="^(describe|edit|generate)$")
     problem_category: Optional[ProblemCategory] = None
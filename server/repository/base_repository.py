@@ -5,9 +5,9 @@ Base repository class for common Firestore operations.
 import logging
 import uuid
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-from services.firebase_service import FirebaseService
+from services.firebase_service import get_firebase_service
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +17,7 @@ class BaseRepository:
     
     def __init__(self):
         """Initialize repository with Firebase service."""
-        self.firebase_service = FirebaseService()
+        self.firebase_service = get_firebase_service()
 
     async def generate_unique_id(self) -> str:
         """Generate a unique ID for new documents."""
@@ -53,10 +53,18 @@ class BaseRepository:
         
         return prepared_data
 
-    async def batch_write(self, operations: list) -> bool:
+    async def batch_write(self, operations: list, bulk: bool = False) -> bool:
         """Execute batch write operations."""
         try:
-            return await self.firebase_service.batch_write(operations)
+            return await self.firebase_service.batch_write(operations, bulk=bulk)
         except Exception as e:
             logger.error(f"Error in batch write: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    async def batch_read(self, refs: list) -> List[Optional[Dict[str, Any]]]:
+        """Read several documents in one round trip."""
+        try:
+            return await self.firebase_service.batch_read(refs)
+        except Exception as e:
+            logger.error(f"Error in batch read: {e}")
+            return [None] * len(refs)
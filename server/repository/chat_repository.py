@@ -18,15 +18,8 @@ class ChatRepository(BaseRepository):
     async def create_chat_session(self, session: ChatSession) -> bool:
         """Create a new chat session."""
         try:
+            # model_dump keeps datetimes, which Firestore stores as timestamps
             session_data = session.model_dump()
-            # Convert datetime objects to ISO format strings for Firestore
-            session_data["created_at"] = session.created_at
-            session_data["updated_at"] = session.updated_at
-            
-            # Convert message timestamps to ISO format
-            for message in session_data.get("messages", []):
-                if "timestamp" in message and isinstance(message["timestamp"], datetime):
-                    message["timestamp"] = message["timestamp"]
             
             return await self.firebase_service.save_chat_session(
                 session.user_id, 
@@ -65,6 +58,17 @@ class ChatRepository(BaseRepository):
         message: ChatMessage
     ) -> bool:
         """Add a message to an existing chat session."""
+        return await self.add_messages_to_session(uid, session_id, [message])
+
+    async def add_messages_to_session(
+        self, 
+        uid: str, 
+        session_id: str, 
+        messages: List[ChatMessage]
+    ) -> bool:
+        """Add several messages to an existing chat session with a single write."""
+        if not messages:
+            return True
         try:
             # Get current session
             session = await self.get_chat_session(uid, session_id)
@@ -72,20 +76,13 @@ class ChatRepository(BaseRepository):
                 logger.error(f"Chat session {session_id} not found for user {uid}")
                 return False
             
-            # Add message and update metadata
-            session.messages.append(message)
-            session.total_messages += 1
+            # Add messages and update metadata
+            session.messages.extend(messages)
+            session.total_messages += len(messages)
             session.updated_at = datetime.utcnow()
             
             # Save updated session
             session_data = session.model_dump()
-            session_data["created_at"] = session.created_at
-            session_data["updated_at"] = session.updated_at
-            
-            # Ensure message timestamps are preserved
-            for msg in session_data.get("messages", []):
-                if "timestamp" in msg and isinstance(msg["timestamp"], datetime):
-                    msg["timestamp"] = msg["timestamp"]
             
             return await self.firebase_service.save_chat_session(uid, session_data)
         except Exception as e:
@@ -109,8 +106,6 @@ class ChatRepository(BaseRepository):
             session.updated_at = datetime.utcnow()
             
             session_data = session.model_dump()
-            session_data["created_at"] = session.created_at
-            session_data["updated_at"] = session.updated_at
             
             return await self.firebase_service.save_chat_session(uid, session_data)
         except Exception as e:
@@ -4,7 +4,7 @@ This is a legacy wrapper that delegates to specialized repositories for backward
 """
 
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, date
 
 from repository.user_repository import UserRepository
@@ -42,6 +42,19 @@ class FirestoreRepository:
         """Update user profile."""
         return await self.user_repo.update_user(uid, updates)
 
+    async def get_user_with_version(self, uid: str) -> Tuple[Optional[UserProfile], Optional[datetime]]:
+        """Get user profile by UID together with its document update time."""
+        return await self.user_repo.get_user_with_version(uid)
+
+    async def update_user_if_unchanged(
+        self,
+        uid: str,
+        updates: Dict[str, Any],
+        update_time: datetime
+    ) -> bool:
+        """Update user profile only if it has not changed since update_time."""
+        return await self.user_repo.update_user_if_unchanged(uid, updates, update_time)
+
     async def update_user_preferences(self, uid: str, preferences: UserPreferences) -> bool:
         """Update user preferences."""
         return await self.user_repo.update_user_preferences(uid, preferences)
@@ -68,6 +81,15 @@ class FirestoreRepository:
         """Add a message to an existing chat session."""
         return await self.chat_repo.add_message_to_session(uid, session_id, message)
 
+    async def add_messages_to_session(
+        self, 
+        uid: str, 
+        session_id: str, 
+        messages: List[ChatMessage]
+    ) -> bool:
+        """Add several messages to an existing chat session with a single write."""
+        return await self.chat_repo.add_messages_to_session(uid, session_id, messages)
+
     async def update_session_summary(
         self, 
         uid: str, 
@@ -162,4 +184,21 @@ class FirestoreRepository:
 
     async def backup_user_data(self, uid: str) -> Optional[Dict[str, Any]]:
         """Create a backup of all user data."""
-        return await self.user_repo.backup_user_data(uid)
\ No newline at end of file
+        return await self.user_repo.backup_user_data(uid)
+
+
+# Process-wide repository; the repositories hold no per-request state
+_firestore_repository: Optional[FirestoreRepository] = None
+
+
+def get_firestore_repository() -> FirestoreRepository:
+    """
+    Return the shared FirestoreRepository.
+    
+    Returns:
+        FirestoreRepository instance
+    """
+    global _firestore_repository
+    if _firestore_repository is None:
+        _firestore_repository = FirestoreRepository()
+    return _firestore_repository
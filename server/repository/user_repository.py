@@ -3,7 +3,7 @@ Repository for user-related Firestore operations.
 """
 
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, date, timedelta
 
 from models.user import UserProfile, UserPreferences
@@ -41,11 +41,34 @@ class UserRepository(BaseRepository):
             logger.error(f"Error updating user: {e}")
             return False
 
+    async def get_user_with_version(self, uid: str) -> Tuple[Optional[UserProfile], Optional[datetime]]:
+        """Get user profile by UID together with its document update time."""
+        try:
+            return await self.firebase_service.get_user_document_with_version(uid)
+        except Exception as e:
+            logger.error(f"Error getting user with version: {e}")
+            return None, None
+
+    async def update_user_if_unchanged(
+        self,
+        uid: str,
+        updates: Dict[str, Any],
+        update_time: datetime
+    ) -> bool:
+        """Update user profile only if it has not changed since update_time."""
+        try:
+            # Add updated timestamp
+            updates["updated_at"] = datetime.utcnow()
+            return await self.firebase_service.update_user_document_if_unchanged(uid, updates, update_time)
+        except Exception as e:
+            logger.error(f"Error updating user: {e}")
+            return False
+
     async def update_user_preferences(self, uid: str, preferences: UserPreferences) -> bool:
         """Update user preferences."""
         try:
             updates = {
-                "preferences": preferences.dict(),
+                "preferences": preferences.model_dump(),
                 "updated_at": datetime.utcnow()
             }
             return await self.firebase_service.update_user_document(uid, updates)
@@ -56,18 +79,10 @@ class UserRepository(BaseRepository):
     async def increment_user_sessions(self, uid: str) -> bool:
         """Increment user's total session count."""
         try:
-            # Get current user document
-            user = await self.firebase_service.get_user_document(uid)
-            if not user:
-                logger.error(f"User {uid} not found for session increment")
-                return False
-            
-            # Increment sessions and update last login
-            updates = {
-                "total_sessions": user.total_sessions + 1,
-                "last_login": datetime.utcnow()
-            }
-            return await self.firebase_service.update_user_document(uid, updates)
+            # Increment sessions server-side and update last login in one write
+            return await self.firebase_service.increment_user_field(
+                uid, "total_sessions", 1, {"last_login": datetime.utcnow()}
+            )
         except Exception as e:
             logger.error(f"Error incrementing user sessions: {e}")
             return False
@@ -243,7 +258,7 @@ class UserRepository(BaseRepository):
             collections_data = await self.firebase_service.get_user_collections_data(uid)
             
             backup_data = {
-                "user_profile": user_profile.dict(),
+                "user_profile": user_profile.model_dump(),
                 "collections": collections_data,
                 "backup_timestamp": datetime.utcnow(),
                 "backup_version": "1.0"
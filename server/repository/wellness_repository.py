@@ -6,11 +6,17 @@ import logging
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 
+from pydantic import TypeAdapter
+
 from models.wellness import MoodEntry, JournalEntry, MeditationSession
 from repository.base_repository import BaseRepository
 
 logger = logging.getLogger(__name__)
 
+# Validate whole result lists in a single pass of the compiled validator
+_mood_entries_adapter = TypeAdapter(List[MoodEntry])
+_journal_entries_adapter = TypeAdapter(List[JournalEntry])
+
 
 class WellnessRepository(BaseRepository):
     """Repository for wellness-related operations (mood, journal, meditation)."""
@@ -19,11 +25,9 @@ class WellnessRepository(BaseRepository):
     async def create_mood_entry(self, mood_entry: MoodEntry) -> bool:
         """Create a new mood entry."""
         try:
-            mood_data = mood_entry.dict()
-            # Convert date and datetime objects for Firestore storage
-            mood_data["date"] = mood_entry.date
-            mood_data["created_at"] = mood_entry.created_at
-            mood_data["updated_at"] = mood_entry.updated_at
+            # model_dump keeps date and datetime objects; dates are converted
+            # to timestamps when the entry is written
+            mood_data = mood_entry.model_dump()
             
             return await self.firebase_service.save_mood_entry(
                 mood_entry.user_id,
@@ -44,7 +48,7 @@ class WellnessRepository(BaseRepository):
         try:
             entries_data = await self.firebase_service.get_mood_entries(uid, limit)
             
-            mood_entries = []
+            rows = []
             for entry_data in entries_data:
                 # Handle different date formats that might come from Firestore
                 if "date" in entry_data:
@@ -59,7 +63,9 @@ class WellnessRepository(BaseRepository):
                     ["created_at", "updated_at"]
                 )
                 
-                mood_entries.append(MoodEntry(**entry_data))
+                rows.append(entry_data)
+            
+            mood_entries = _mood_entries_adapter.validate_python(rows)
             
             # Filter by date range if specified
             if start_date or end_date:
@@ -82,10 +88,7 @@ class WellnessRepository(BaseRepository):
         try:
             mood_entry.updated_at = datetime.utcnow()
             
-            mood_data = mood_entry.dict()
-            mood_data["date"] = mood_entry.date
-            mood_data["created_at"] = mood_entry.created_at
-            mood_data["updated_at"] = mood_entry.updated_at
+            mood_data = mood_entry.model_dump()
             
             return await self.firebase_service.save_mood_entry(uid, mood_data)
         except Exception as e:
@@ -113,10 +116,8 @@ class WellnessRepository(BaseRepository):
     async def create_journal_entry(self, journal_entry: JournalEntry) -> bool:
         """Create a new journal entry."""
         try:
-            journal_data = journal_entry.dict()
-            # Store datetime objects directly for Firestore
-            journal_data["created_at"] = journal_entry.created_at
-            journal_data["updated_at"] = journal_entry.updated_at
+            # model_dump keeps datetimes, which Firestore stores as timestamps
+            journal_data = journal_entry.model_dump()
             
             return await self.firebase_service.save_journal_entry(
                 journal_entry.user_id,
@@ -131,17 +132,13 @@ class WellnessRepository(BaseRepository):
         try:
             entries_data = await self.firebase_service.get_journal_entries(uid, limit)
             
-            journal_entries = []
-            for entry_data in entries_data:
+            rows = [
                 # Handle datetime conversions from Firestore
-                entry_data = self._handle_timestamp_conversion(
-                    entry_data, 
-                    ["created_at", "updated_at"]
-                )
-                
-                journal_entries.append(JournalEntry(**entry_data))
+                self._handle_timestamp_conversion(entry_data, ["created_at", "updated_at"])
+                for entry_data in entries_data
+            ]
             
-            return journal_entries
+            return _journal_entries_adapter.validate_python(rows)
         except Exception as e:
             logger.error(f"Error getting journal entries: {e}")
             return []
@@ -151,9 +148,7 @@ class WellnessRepository(BaseRepository):
         try:
             journal_entry.updated_at = datetime.utcnow()
             
-            journal_data = journal_entry.dict()
-            journal_data["created_at"] = journal_entry.created_at
-            journal_data["updated_at"] = journal_entry.updated_at
+            journal_data = journal_entry.model_dump()
             
             return await self.firebase_service.save_journal_entry(uid, journal_data)
         except Exception as e:
@@ -181,11 +176,8 @@ class WellnessRepository(BaseRepository):
     async def create_meditation_session(self, meditation: MeditationSession) -> bool:
         """Create a new meditation session."""
         try:
-            meditation_data = meditation.dict()
-            # Store datetime objects directly for Firestore
-            meditation_data["created_at"] = meditation.created_at
-            if meditation.completed_at:
-                meditation_data["completed_at"] = meditation.completed_at
+            # model_dump keeps datetimes, which Firestore stores as timestamps
+            meditation_data = meditation.model_dump()
             
             return await self.firebase_service.save_meditation_session(
                 meditation.user_id,
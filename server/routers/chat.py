@@ -2,6 +2,7 @@
 Chat router for text and voice conversations with Mitra AI.
 """
 
+import asyncio
 import logging
 from typing import List, Optional
 from datetime import datetime
@@ -9,7 +10,7 @@ import uuid
 import base64
 
 from fastapi import APIRouter, HTTPException, Depends, Header, File, UploadFile
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 
 from models.chat import (
     TextChatRequest, VoiceChatRequest, ChatResponse, 
@@ -23,7 +24,7 @@ from models.user import ProblemCategory, UserProfile
 from services.gemini_service import GeminiService
 from services.safety_service import SafetyService
 from services.wellness_service import WellnessService
-from repository.firestore_repository import FirestoreRepository
+from repository.firestore_repository import FirestoreRepository, get_firestore_repository
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +41,7 @@ def get_wellness_service() -> WellnessService:
     return WellnessService()
 
 def get_repository() -> FirestoreRepository:
-    return FirestoreRepository()
+    return get_firestore_repository()
 
 async def get_current_user(authorization: str = Header(None)) -> str:
     """Extract user ID from Firebase ID token in authorization header."""
@@ -52,8 +53,8 @@ async def get_current_user(authorization: str = Header(None)) -> str:
         token = authorization.split(" ")[1]
 
         # Initialize Firebase service to verify token
-        from services.firebase_service import FirebaseService
-        firebase_service = FirebaseService()
+        from services.firebase_service import get_firebase_service
+        firebase_service = get_firebase_service()
 
         # Verify ID token and extract claims
         decoded_token = await firebase_service.verify_id_token(token)
@@ -98,14 +99,11 @@ async def send_text_message(
                 problem_category=request.problem_category,
                 generated_resources=[]
             )
+            await repository.create_chat_session(session)
         elif request.problem_category and session.problem_category != request.problem_category:
             # Update session problem category if changed
             session.problem_category = request.problem_category
         
-        # Create or update session
-        if not await repository.get_chat_session(current_user, session_id):
-            await repository.create_chat_session(session)
-        
         # Create user message
         user_message = ChatMessage(
             id=str(uuid.uuid4()),
@@ -124,12 +122,13 @@ async def send_text_message(
         
         user_message.safety_status = safety_status
         
-        # Add user message to session
-        await repository.add_message_to_session(current_user, session_id, user_message)
-        
         # Check if crisis intervention is needed
         if safety_status == SafetyStatus.CRISIS:
-            crisis_response = await safety_service.generate_crisis_response(severity, request.message)
+            # Save the user message while the crisis response is generated
+            _, crisis_response = await asyncio.gather(
+                repository.add_message_to_session(current_user, session_id, user_message),
+                safety_service.generate_crisis_response(severity, request.message)
+            )
             
             # Log safety incident
             await safety_service.log_safety_incident(
@@ -203,6 +202,9 @@ async def send_text_message(
             except Exception as e:
                 logger.warning(f"Failed to generate image: {e}")
         
+        # Serialize grounding sources once for both the stored message and the response
+        grounding_dicts = [source.model_dump() for source in grounding_sources] if grounding_sources else []
+        
         # Create assistant message
         assistant_message = ChatMessage(
             id=str(uuid.uuid4()),
@@ -215,15 +217,14 @@ async def send_text_message(
             timestamp=datetime.utcnow(),
             safety_status=SafetyStatus.SAFE,
             metadata={
-                "grounding_sources": [source.dict() for source in grounding_sources] if grounding_sources else [],
+                "grounding_sources": grounding_dicts,
                 "thinking": thinking_text,
-                "generated_resources": [resource.dict() for resource in generated_resources] if generated_resources else []
+                "generated_resources": [resource.model_dump() for resource in generated_resources] if generated_resources else []
             }
         )
         
-        # Add messages to session
-        await repository.add_message_to_session(current_user, session_id, user_message)
-        await repository.add_message_to_session(current_user, session_id, assistant_message)
+        # Add both messages to session in one read and one write
+        await repository.add_messages_to_session(current_user, session_id, [user_message, assistant_message])
         
         # Update session message count
         session.total_messages += 2
@@ -235,7 +236,7 @@ async def send_text_message(
             response_text=response_text,
             generated_image=generated_image,
             safety_status=SafetyStatus.SAFE,
-            grounding_sources=[source.dict() for source in grounding_sources] if grounding_sources else None,
+            grounding_sources=grounding_dicts or None,
             timestamp=datetime.utcnow(),
             thinking_text=thinking_text
         )
@@ -245,6 +246,116 @@ async def send_text_message(
         raise HTTPException(status_code=500, detail="Failed to process message")
 
 
+@router.post("/text/stream")
+async def stream_text_message(
+    request: TextChatRequest,
+    current_user: str = Depends(get_current_user),
+    gemini_service: GeminiService = Depends(get_gemini_service),
+    safety_service: SafetyService = Depends(get_safety_service),
+    repository: FirestoreRepository = Depends(get_repository)
+):
+    """Send a text message to Mitra AI and stream the reply as plain text."""
+    try:
+        # Load profile and session together
+        session_id = request.session_id or str(uuid.uuid4())
+        user_profile, session = await asyncio.gather(
+            repository.get_user(current_user),
+            repository.get_chat_session(current_user, session_id)
+        )
+        
+        if not session:
+            session = ChatSession(
+                session_id=session_id,
+                user_id=current_user,
+                mode=ChatMode.TEXT,
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow(),
+                messages=[],
+                is_active=True,
+                total_messages=0,
+                problem_category=request.problem_category,
+                generated_resources=[]
+            )
+            await repository.create_chat_session(session)
+        elif request.problem_category and session.problem_category != request.problem_category:
+            session.problem_category = request.problem_category
+        
+        user_message = ChatMessage(
+            id=str(uuid.uuid4()),
+            role=MessageRole.USER,
+            type=MessageType.TEXT,
+            content=MessageContent(text=request.message),
+            timestamp=datetime.utcnow(),
+            safety_status=SafetyStatus.SAFE
+        )
+        
+        # Safety assessment happens before any text is streamed
+        safety_status, confidence, severity = await safety_service.assess_safety(
+            request.message,
+            session.messages
+        )
+        user_message.safety_status = safety_status
+        
+        headers = {"X-Session-Id": session_id, "X-Message-Id": user_message.id}
+        
+        if safety_status == SafetyStatus.CRISIS:
+            _, crisis_response = await asyncio.gather(
+                repository.add_message_to_session(current_user, session_id, user_message),
+                safety_service.generate_crisis_response(severity, request.message)
+            )
+            await safety_service.log_safety_incident(
+                current_user,
+                request.message,
+                {
+                    "status": safety_status.value,
+                    "confidence": confidence,
+                    "severity": severity.value if severity else None
+                }
+            )
+            return StreamingResponse(
+                iter([crisis_response.message]),
+                media_type="text/plain; charset=utf-8",
+                headers=headers
+            )
+        
+        all_messages = session.messages + [user_message]
+        
+        async def reply_stream():
+            text_parts = []
+            grounding_sources = None
+            async for text, sources in gemini_service.stream_text_response(
+                all_messages,
+                user_profile=user_profile,
+                problem_category=session.problem_category,
+                include_grounding=request.include_grounding
+            ):
+                if sources:
+                    grounding_sources = sources
+                if text:
+                    text_parts.append(text)
+                    yield text
+            
+            # Persist the exchange once the full reply is known
+            assistant_message = ChatMessage(
+                id=str(uuid.uuid4()),
+                role=MessageRole.ASSISTANT,
+                type=MessageType.TEXT,
+                content=MessageContent(text="".join(text_parts)),
+                timestamp=datetime.utcnow(),
+                safety_status=SafetyStatus.SAFE,
+                metadata={
+                    "grounding_sources": [source.model_dump() for source in grounding_sources] if grounding_sources else []
+                }
+            )
+            await repository.add_messages_to_session(current_user, session_id, [user_message, assistant_message])
+        
+        return StreamingResponse(reply_stream(), media_type="text/plain; charset=utf-8", headers=headers)
+        
+    except Exception as e:
+        logger.error(f"Error in streaming text chat: {e}")
+        raise HTTPException(status_code=500, detail="Failed to process message")
+
+
 @router.post("/voice", response_model=ChatResponse)
 async def send_voice_message(
     audio_file: UploadFile = File(...),
@@ -378,6 +489,118 @@ async def send_voice_message(
         raise HTTPException(status_code=500, detail="Failed to process voice message")
 
 
+@router.post("/voice/stream")
+async def stream_voice_message(
+    audio_file: UploadFile = File(...),
+    session_id: Optional[str] = None,
+    current_user: str = Depends(get_current_user),
+    gemini_service: GeminiService = Depends(get_gemini_service),
+    safety_service: SafetyService = Depends(get_safety_service),
+    repository: FirestoreRepository = Depends(get_repository)
+):
+    """Send a voice message to Mitra AI and stream the spoken reply as raw PCM audio."""
+    try:
+        # Read audio data
+        audio_data = await audio_file.read()
+        
+        # Transcription and session lookup are independent, so run them together
+        session_id = session_id or str(uuid.uuid4())
+        transcribed_text, user_profile, session = await asyncio.gather(
+            gemini_service.process_voice_input(audio_data),
+            repository.get_user(current_user),
+            repository.get_chat_session(current_user, session_id)
+        )
+        
+        if not transcribed_text:
+            raise HTTPException(status_code=400, detail="Could not transcribe audio")
+        
+        if not session:
+            session = ChatSession(
+                session_id=session_id,
+                user_id=current_user,
+                mode=ChatMode.VOICE,
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow(),
+                messages=[],
+                is_active=True,
+                total_messages=0
+            )
+            await repository.create_chat_session(session)
+        
+        user_message = ChatMessage(
+            id=str(uuid.uuid4()),
+            role=MessageRole.USER,
+            type=MessageType.AUDIO,
+            content=MessageContent(
+                text=transcribed_text,
+                audio_data=audio_data
+            ),
+            timestamp=datetime.utcnow(),
+            safety_status=SafetyStatus.SAFE
+        )
+        
+        # Safety assessment happens before any audio is streamed
+        safety_status, confidence, severity = await safety_service.assess_safety(
+            transcribed_text,
+            session.messages
+        )
+        user_message.safety_status = safety_status
+        
+        # Crisis replies are text, so return them as a regular JSON response
+        if safety_status == SafetyStatus.CRISIS:
+            _, crisis_response = await asyncio.gather(
+                repository.add_message_to_session(current_user, session_id, user_message),
+                safety_service.generate_crisis_response(severity, transcribed_text)
+            )
+            return ChatResponse(
+                session_id=session_id,
+                message_id=user_message.id,
+                response_text=crisis_response.message,
+                safety_status=SafetyStatus.CRISIS,
+                timestamp=datetime.utcnow()
+            )
+        
+        all_messages = session.messages + [user_message]
+        
+        async def audio_stream():
+            # Frames go out as they arrive; the copy kept for persistence grows in place
+            audio_buf = bytearray()
+            transcription = None
+            async for audio_chunk, text in gemini_service.stream_voice_response(
+                all_messages,
+                user_profile=user_profile,
+                problem_category=session.problem_category
+            ):
+                if audio_chunk:
+                    audio_buf.extend(audio_chunk)
+                    yield audio_chunk
+                if text:
+                    transcription = text
+            
+            # Persist the exchange once the full reply is known
+            assistant_message = ChatMessage(
+                id=str(uuid.uuid4()),
+                role=MessageRole.ASSISTANT,
+                type=MessageType.AUDIO,
+                content=MessageContent(
+                    text=transcription,
+                    audio_data=bytes(audio_buf)
+                ),
+                timestamp=datetime.utcnow(),
+                safety_status=SafetyStatus.SAFE
+            )
+            await repository.add_messages_to_session(current_user, session_id, [user_message, assistant_message])
+        
+        headers = {"X-Session-Id": session_id, "X-Message-Id": user_message.id}
+        return StreamingResponse(audio_stream(), media_type="audio/pcm", headers=headers)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in streaming voice chat: {e}")
+        raise HTTPException(status_code=500, detail="Failed to process voice message")
+
+
 @router.post("/multimodal", response_model=ChatResponse)
 async def send_multimodal_message(
     request: MultimodalChatRequest,
@@ -411,7 +634,8 @@ async def send_multimodal_message(
             type=MessageType.IMAGE,
             content=MessageContent(
                 text=request.text,
-                image_data=request.image_data
+                image_data=request.image_data,
+                image_mime_type=request.image_mime_type
             ),
             timestamp=datetime.utcnow(),
             safety_status=SafetyStatus.SAFE
@@ -576,13 +800,14 @@ async def generate_session_resources(
 ):
     """Generate helpful resources based on chat session content."""
     try:
-        # Get user profile for personalization
-        user_profile = await repository.get_user(current_user)
+        # Get user profile and chat session together
+        user_profile, session = await asyncio.gather(
+            repository.get_user(current_user),
+            repository.get_chat_session(current_user, session_id)
+        )
         if not user_profile:
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Get chat session
-        session = await repository.get_chat_session(current_user, session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
         
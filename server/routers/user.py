@@ -2,11 +2,12 @@
 User router for authentication and user management.
 """
 
+import asyncio
 import logging
-from typing import Optional
+from typing import Any, Optional, Dict, Tuple
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Header
 
 from models.user import (
     UserProfile, UserResponse, CreateUserRequest, UpdateUserRequest,
@@ -14,16 +15,19 @@ from models.user import (
     OnboardingRequest, AgeGroup, Gender, VoiceOption
 )
 from models.common import APIResponse, ErrorResponse, ErrorType
-from services.firebase_service import FirebaseService
+from services.firebase_service import FirebaseService, get_firebase_service
 from services.voice_service import VoiceService
 from services.image_service import ImageService
-from repository.firestore_repository import FirestoreRepository
+from repository.firestore_repository import FirestoreRepository, get_firestore_repository
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 # Predefined Mitra companions with their characteristics
+# Attempts at the link write when other requests update the profile at the same time
+LINK_ACCOUNT_MAX_ATTEMPTS = 3
+
 PREDEFINED_MITRA_COMPANIONS = {
     "Mitra": {
         "gender": "feminine",
@@ -72,12 +76,31 @@ PREDEFINED_MITRA_COMPANIONS = {
     }
 }
 
-# Dependency injection
-def get_firebase_service() -> FirebaseService:
-    return FirebaseService()
+# Default field values for newly created profiles, dumped once from a validated profile
+_DEFAULT_PROFILE_FIELDS: Dict[str, Any] = UserProfile(
+    uid="",
+    created_at=datetime.min,
+    last_login=datetime.min,
+    preferences=UserPreferences()
+).model_dump()
+
+
+def _new_user_profile(uid: str, **overrides) -> UserProfile:
+    """Build and validate a default profile for a new user, applying any overrides."""
+    now = datetime.utcnow()
+    # Overrides may carry token claims, so validate them rather than copying them in
+    return UserProfile.model_validate({
+        **_DEFAULT_PROFILE_FIELDS,
+        "uid": uid,
+        "created_at": now,
+        "last_login": now,
+        **overrides
+    })
+
 
+# Dependency injection
 def get_repository() -> FirestoreRepository:
-    return FirestoreRepository()
+    return get_firestore_repository()
 
 def get_voice_service() -> VoiceService:
     return VoiceService()
@@ -92,7 +115,7 @@ async def get_current_user_optional(authorization: str = Header(None)) -> Option
     
     try:
         token = authorization.split(" ")[1]
-        firebase_service = FirebaseService()
+        firebase_service = get_firebase_service()
         token_claims = await firebase_service.verify_id_token(token)
         return token_claims.get("uid")
     except Exception:
@@ -105,7 +128,7 @@ async def get_current_user(authorization: str = Header(None)) -> str:
     
     try:
         token = authorization.split(" ")[1]
-        firebase_service = FirebaseService()
+        firebase_service = get_firebase_service()
         token_claims = await firebase_service.verify_id_token(token)
         user_id = token_claims.get("uid")
         
@@ -153,19 +176,7 @@ async def create_anonymous_user(
             )
         
         # Create user profile with actual Firebase user ID
-        user_profile = UserProfile(
-            uid=current_user_id,
-            provider=UserProvider.ANONYMOUS,
-            email=None,
-            display_name=None,
-            is_anonymous=True,
-            status=UserStatus.ACTIVE,
-            created_at=datetime.utcnow(),
-            last_login=datetime.utcnow(),
-            preferences=UserPreferences(),
-            total_sessions=0,
-            last_mood_entry=None
-        )
+        user_profile = _new_user_profile(current_user_id)
         
         # Save to database
         success = await repository.create_user(user_profile)
@@ -205,7 +216,8 @@ async def complete_user_onboarding(
     """Complete user onboarding with personalization."""
     try:
         logger.info(f"Onboarding request received for user {current_user}")
-        logger.info(f"Request data: {request.dict()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request data: %s", request.model_dump_json())
         
         # Get existing user profile
         user_profile = await repository.get_user(current_user)
@@ -392,7 +404,7 @@ async def update_user_profile(
             updates["display_name"] = request.display_name
         
         if request.preferences is not None:
-            updates["preferences"] = request.preferences.dict()
+            updates["preferences"] = request.preferences.model_dump()
         
         if updates:
             success = await repository.update_user(current_user, updates)
@@ -435,8 +447,8 @@ async def link_account(
         # Verify the ID token
         token_claims = await firebase_service.verify_id_token(request.id_token)
         
-        # Get current user profile
-        user_profile = await repository.get_user(current_user)
+        # Get current user profile with its version, so a concurrent link cannot both succeed
+        user_profile, update_time = await repository.get_user_with_version(current_user)
         if not user_profile:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -451,8 +463,17 @@ async def link_account(
             "last_login": datetime.utcnow()
         }
         
-        success = await repository.update_user(current_user, updates)
-        if not success:
+        for _ in range(LINK_ACCOUNT_MAX_ATTEMPTS):
+            if await repository.update_user_if_unchanged(current_user, updates, update_time):
+                break
+            # Unrelated writes (session counts, last_login) also move the version,
+            # so re-read and retry while the account is still anonymous
+            user_profile, update_time = await repository.get_user_with_version(current_user)
+            if not user_profile:
+                raise HTTPException(status_code=404, detail="User not found")
+            if not user_profile.is_anonymous:
+                raise HTTPException(status_code=409, detail="Account is already linked")
+        else:
             raise HTTPException(status_code=500, detail="Failed to link account")
         
         # Get updated profile
@@ -501,18 +522,12 @@ async def sign_in_user(
         
         if not user_profile:
             # Create new user profile for existing Firebase user
-            user_profile = UserProfile(
-                uid=user_id,
+            user_profile = _new_user_profile(
+                user_id,
                 provider=UserProvider.GOOGLE,  # Determine from token
                 email=token_claims.get("email"),
                 display_name=token_claims.get("name"),
-                is_anonymous=False,
-                status=UserStatus.ACTIVE,
-                created_at=datetime.utcnow(),
-                last_login=datetime.utcnow(),
-                preferences=UserPreferences(),
-                total_sessions=0,
-                last_mood_entry=None
+                is_anonymous=False
             )
             
             await repository.create_user(user_profile)
@@ -536,17 +551,15 @@ async def sign_in_user(
 
 @router.post("/refresh-session")
 async def refresh_session(
+    background_tasks: BackgroundTasks,
     current_user: str = Depends(get_current_user),
     repository: FirestoreRepository = Depends(get_repository)
 ):
     """Refresh user session and update activity timestamp."""
     try:
-        # Update last login and increment session count
-        await repository.update_user(current_user, {
-            "last_login": datetime.utcnow()
-        })
-        
-        await repository.increment_user_sessions(current_user)
+        # Update last login and increment session count in one write, after
+        # the response is sent since the caller does not wait on it
+        background_tasks.add_task(repository.increment_user_sessions, current_user)
         
         return {"message": "Session refreshed"}
         
@@ -651,12 +664,14 @@ async def generate_predefined_mitra_images(
     try:
         results = {}
         
-        for mitra_name, companion_info in PREDEFINED_MITRA_COMPANIONS.items():
+        # Check all companions for existing images concurrently
+        existing_urls = await asyncio.gather(
+            *[_get_existing_mitra_image_url(mitra_name) for mitra_name in PREDEFINED_MITRA_COMPANIONS]
+        )
+        
+        generated = {}
+        for (mitra_name, companion_info), existing_url in zip(PREDEFINED_MITRA_COMPANIONS.items(), existing_urls):
             try:
-                logger.info(f"Generating profile image for predefined Mitra: {mitra_name}")
-                
-                # Check if image already exists
-                existing_url = await _get_existing_mitra_image_url(mitra_name)
                 if existing_url:
                     results[mitra_name] = {
                         "status": "existing",
@@ -665,6 +680,8 @@ async def generate_predefined_mitra_images(
                     }
                     continue
                 
+                logger.info(f"Generating profile image for predefined Mitra: {mitra_name}")
+                
                 # Generate new image
                 prompt = f"""A {companion_info['description']}, {companion_info['style']}, 
                 digital art portrait, soft lighting, peaceful expression, culturally appropriate for Indian youth, 
@@ -673,14 +690,7 @@ async def generate_predefined_mitra_images(
                 image_data = await image_service.generate_image(prompt, "ai_companion_portrait")
                 
                 if image_data:
-                    # Save to storage
-                    image_url = await _save_mitra_image_to_storage(mitra_name, image_data)
-                    
-                    results[mitra_name] = {
-                        "status": "generated",
-                        "url": image_url,
-                        "message": f"Successfully generated image ({len(image_data)} bytes)"
-                    }
+                    generated[mitra_name] = image_data
                 else:
                     results[mitra_name] = {
                         "status": "failed",
@@ -696,6 +706,17 @@ async def generate_predefined_mitra_images(
                     "message": f"Error: {str(e)}"
                 }
         
+        # Save all generated images to storage concurrently
+        image_urls = await get_firebase_service().upload_files([
+            _mitra_image_upload(mitra_name, image_data) for mitra_name, image_data in generated.items()
+        ])
+        for (mitra_name, image_data), image_url in zip(generated.items(), image_urls):
+            results[mitra_name] = {
+                "status": "generated",
+                "url": image_url,
+                "message": f"Successfully generated image ({len(image_data)} bytes)"
+            }
+        
         return {
             "message": "Mitra image generation completed",
             "results": results,
@@ -714,7 +735,7 @@ async def list_mitra_images():
     Admin endpoint to list all existing Mitra profile images in Firebase Storage.
     """
     try:
-        firebase_service = FirebaseService()
+        firebase_service = get_firebase_service()
         
         # List all files in the mitra_profiles directory
         file_paths = await firebase_service.list_files_in_directory("mitra_profiles")
@@ -760,11 +781,11 @@ async def _get_existing_mitra_image_url(mitra_name: str) -> Optional[str]:
         URL of existing image or None if not found
     """
     try:
-        firebase_service = FirebaseService()
+        firebase_service = get_firebase_service()
         file_path = f"mitra_profiles/{mitra_name.lower()}.jpg"
         
         # Check if file exists and get public URL
-        public_url = await firebase_service.get_file_public_url(file_path)
+        public_url = await firebase_service.get_file_public_url(file_path, verify=True)
         
         if public_url:
             logger.info(f"Found existing image for {mitra_name}: {public_url}")
@@ -778,6 +799,27 @@ async def _get_existing_mitra_image_url(mitra_name: str) -> Optional[str]:
         return None
 
 
+def _mitra_image_upload(mitra_name: str, image_data: bytes) -> Tuple[bytes, str, str, Dict[str, str]]:
+    """
+    Build the storage upload arguments for a Mitra profile image.
+    
+    Args:
+        mitra_name: Name of the predefined Mitra companion
+        image_data: Generated image data as bytes
+        
+    Returns:
+        (file_data, file_path, content_type, metadata) tuple for upload_file_to_storage
+    """
+    file_path = f"mitra_profiles/{mitra_name.lower()}.jpg"
+    metadata = {
+        "mitra_name": mitra_name,
+        "generated_at": datetime.utcnow().isoformat(),
+        "content_type": "image/jpeg",
+        "purpose": "ai_companion_profile"
+    }
+    return image_data, file_path, "image/jpeg", metadata
+
+
 async def _save_mitra_image_to_storage(mitra_name: str, image_data: bytes) -> Optional[str]:
     """
     Save a generated Mitra profile image to Firebase Storage.
@@ -790,24 +832,10 @@ async def _save_mitra_image_to_storage(mitra_name: str, image_data: bytes) -> Op
         URL of saved image or None if failed
     """
     try:
-        firebase_service = FirebaseService()
-        file_path = f"mitra_profiles/{mitra_name.lower()}.jpg"
-        
-        # Prepare metadata
-        metadata = {
-            "mitra_name": mitra_name,
-            "generated_at": datetime.utcnow().isoformat(),
-            "content_type": "image/jpeg",
-            "purpose": "ai_companion_profile"
-        }
+        firebase_service = get_firebase_service()
         
         # Upload to Firebase Storage
-        public_url = await firebase_service.upload_file_to_storage(
-            file_data=image_data,
-            file_path=file_path,
-            content_type="image/jpeg",
-            metadata=metadata
-        )
+        public_url = await firebase_service.upload_file_to_storage(*_mitra_image_upload(mitra_name, image_data))
         
         if public_url:
             logger.info(f"Successfully saved profile image for {mitra_name} ({len(image_data)} bytes): {public_url}")
@@ -3,20 +3,19 @@ Voice conversation router with WebSocket support for real-time Live API interact
 """
 
 import logging
-import json
-import asyncio
 import uuid
 import base64
 from typing import Optional
 from datetime import datetime
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, Header
 from fastapi.responses import JSONResponse
 
 from models.wellness import VoiceSessionRequest, VoiceSessionResponse, VoiceSessionState
 from models.user import UserProfile, ProblemCategory
 from services.live_voice_service import LiveVoiceService
-from repository.firestore_repository import FirestoreRepository
+from repository.firestore_repository import FirestoreRepository, get_firestore_repository
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +32,7 @@ def get_live_voice_service() -> LiveVoiceService:
     return _live_voice_service_instance
 
 def get_repository() -> FirestoreRepository:
-    return FirestoreRepository()
+    return get_firestore_repository()
 
 async def get_current_user(authorization: str = Header(None)) -> str:
     """Extract user ID from Firebase ID token in authorization header."""
@@ -45,8 +44,8 @@ async def get_current_user(authorization: str = Header(None)) -> str:
         token = authorization.split(" ")[1]
 
         # Initialize Firebase service to verify token
-        from services.firebase_service import FirebaseService
-        firebase_service = FirebaseService()
+        from services.firebase_service import get_firebase_service
+        firebase_service = get_firebase_service()
 
         # Verify ID token and extract claims
         decoded_token = await firebase_service.verify_id_token(token)
@@ -63,8 +62,8 @@ async def get_current_user_from_token(token: str) -> str:
     """Extract user ID from Firebase ID token."""
     try:
         # Initialize Firebase service to verify token
-        from services.firebase_service import FirebaseService
-        firebase_service = FirebaseService()
+        from services.firebase_service import get_firebase_service
+        firebase_service = get_firebase_service()
 
         # Verify ID token and extract claims
         decoded_token = await firebase_service.verify_id_token(token)
@@ -201,14 +200,14 @@ async def voice_websocket_endpoint(
         # Handle WebSocket messages
         while True:
             try:
-                # Receive message from client
-                message = await websocket.receive_json()
+                # Receive message from client; frames carry base64 audio, so parse with orjson
+                message = orjson.loads(await websocket.receive_text())
                 await _handle_websocket_message(websocket, session_id, message, voice_service)
 
             except WebSocketDisconnect:
                 logger.info(f"WebSocket disconnected for session {session_id}")
                 break
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 await websocket.send_json({
                     "type": "error",
                     "data": {"message": "Invalid JSON message"}
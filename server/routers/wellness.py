@@ -2,6 +2,7 @@
 Wellness router for mood tracking, journaling, and meditation features.
 """
 
+import asyncio
 import logging
 from typing import List, Optional
 from datetime import datetime, date, timedelta
@@ -18,7 +19,7 @@ from models.wellness import (
 )
 from models.common import APIResponse, ErrorResponse, ErrorType
 from services.gemini_service import GeminiService
-from repository.firestore_repository import FirestoreRepository
+from repository.firestore_repository import FirestoreRepository, get_firestore_repository
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +30,7 @@ def get_gemini_service() -> GeminiService:
     return GeminiService()
 
 def get_repository() -> FirestoreRepository:
-    return FirestoreRepository()
+    return get_firestore_repository()
 
 async def get_current_user(authorization: str = Header(None)) -> str:
     """Extract user ID from authorization header."""
@@ -209,7 +210,7 @@ async def get_mood_analysis(
             "period_days": days
         }
         
-        insights_data = await gemini_service.generate_wellness_insight(mood_data)
+        insights_data = await gemini_service.generate_wellness_insight(mood_data, strict=False)
         
         return MoodAnalysis(
             period_start=start_date,
@@ -352,11 +353,13 @@ async def generate_custom_meditation(
 ):
     """Generate a custom meditation session."""
     try:
-        # Generate meditation script
+        # Generate meditation script in the user's persona
+        user_profile = await repository.get_user(current_user)
         meditation_script = await gemini_service.generate_meditation_script(
             request.type.value,
             request.duration_minutes,
-            request.focus_area
+            request.focus_area,
+            user_profile=user_profile
         )
         
         # Create meditation session record
@@ -463,9 +466,12 @@ async def get_wellness_dashboard(
 ):
     """Get comprehensive wellness dashboard data."""
     try:
-        # Get recent data
-        recent_moods = await repository.get_mood_entries(current_user, limit=7)
-        recent_journals = await repository.get_journal_entries(current_user, limit=5)
+        # Get recent data and stats concurrently
+        recent_moods, recent_journals, stats = await asyncio.gather(
+            repository.get_mood_entries(current_user, limit=7),
+            repository.get_journal_entries(current_user, limit=5),
+            repository.get_user_stats(current_user)
+        )
         
         # Calculate current mood and trend
         current_mood = None
@@ -485,9 +491,6 @@ async def get_wellness_dashboard(
                 else:
                     mood_trend = "stable"
         
-        # Get user stats
-        stats = await repository.get_user_stats(current_user)
-        
         return WellnessDashboard(
             user_id=current_user,
             current_mood=current_mood,
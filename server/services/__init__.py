@@ -9,7 +9,7 @@ from .voice_service import VoiceService
 from .image_service import ImageService
 from .wellness_service import WellnessService
 from .gemini_service import GeminiService
-from .firebase_service import FirebaseService
+from .firebase_service import FirebaseService, get_firebase_service
 from .safety_service import SafetyService, CrisisSeverity
 
 __all__ = [
@@ -20,6 +20,7 @@ __all__ = [
     "WellnessService",
     "GeminiService",
     "FirebaseService",
+    "get_firebase_service",
     "SafetyService",
     "CrisisSeverity"
 ]
\ No newline at end of file
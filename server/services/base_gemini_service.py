@@ -2,30 +2,173 @@
 Base Gemini service providing common functionality for all Gemini-based services.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-from google import genai
-from google.genai import types
-from PIL import Image
-import io
+import random
+import textwrap
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, List, Dict, Any, Optional, AsyncIterator
+import httpx
+from cachetools import LRUCache, TTLCache
+from google.genai import errors, types
 
 from core.config import settings
-from models.chat import ChatMessage, MessageRole, MessageType
+from models.chat import ChatMessage, MessageContent, MessageRole, MessageType
 from models.common import GenerationConfig, GroundingSource
 from models.user import UserProfile, AgeGroup, Gender, ProblemCategory
 
+if TYPE_CHECKING:
+    from google import genai
+
 logger = logging.getLogger(__name__)
 
+# Lifetime of provider-side cached system instructions
+INSTRUCTION_CACHE_TTL_SECONDS = 3600
+# Recreate a cached instruction this long before the provider expires it
+INSTRUCTION_CACHE_REFRESH_MARGIN = 300
 
-class BaseGeminiService:
-    """Base service for common Gemini AI functionality."""
+# (model, instruction) -> cached content name, or None if caching failed; entries
+# expire shortly before the provider cache so it is recreated in time
+_instruction_caches: TTLCache = TTLCache(
+    maxsize=1024, ttl=INSTRUCTION_CACHE_TTL_SECONDS - INSTRUCTION_CACHE_REFRESH_MARGIN
+)
+
+# Marks a (model, instruction) key with no cache entry; None means caching failed
+_NOT_CACHED = object()
+
+# Locks for (model, instruction) keys whose cache is being created, so concurrent
+# misses create a single provider cache; removed once the cache exists
+_instruction_cache_locks: Dict[tuple, asyncio.Lock] = {}
+
+# Prebuilt instruction-bearing generation configs keyed by (model, instruction, cache handle)
+_base_configs: LRUCache = LRUCache(maxsize=1024)
+
+# Connection pool limits for the async Gemini HTTP client; HTTP/2 multiplexes
+# concurrent requests as streams, so a handful of connections is enough
+GEMINI_MAX_CONNECTIONS = 4
+GEMINI_MAX_KEEPALIVE_CONNECTIONS = 4
+
+# Shared gate so bursts queue here instead of tripping the project rate limits
+_generation_slots: Optional[asyncio.BoundedSemaphore] = None
+
+
+def _get_generation_slots() -> asyncio.BoundedSemaphore:
+    """Create the generation semaphore on first use inside the running loop."""
+    global _generation_slots
+    if _generation_slots is None:
+        _generation_slots = asyncio.BoundedSemaphore(settings.gemini_max_concurrency)
+    return _generation_slots
+
+
+# First backoff delay before retrying a failed generate call; doubles per attempt
+GEMINI_RETRY_BASE_DELAY = 1.0
+
+
+def _is_retryable(error: errors.APIError) -> bool:
+    """Whether a Gemini API error is transient (rate limited or server side)."""
+    return error.code == 429 or (error.code or 0) >= 500
+
+
+async def _backoff(attempt: int, error: errors.APIError, operation: str) -> None:
+    """
+    Wait before retrying a failed generate call.
     
-    def __init__(self):
-        """Initialize Gemini client."""
-        self.client = genai.Client(api_key=settings.google_api_key)
+    The generation slot is not held while waiting, so other requests keep
+    flowing. Jitter keeps concurrent retries from landing together.
+    
+    Args:
+        attempt: Number of the attempt that just failed, starting at 1
+        error: Error raised by that attempt
+        operation: Name of the call, for logging
+    """
+    delay = GEMINI_RETRY_BASE_DELAY * 2 ** (attempt - 1)
+    delay += random.uniform(0, delay / 2)
+    logger.warning(
+        f"{operation} failed with {error.code} (attempt {attempt}/{settings.gemini_max_attempts}), "
+        f"retrying in {delay:.1f}s"
+    )
+    await asyncio.sleep(delay)
+
+
+# Gemini role for each message role; anything else is spoken by the model
+_GEMINI_USER_ROLE = "user"
+_GEMINI_MODEL_ROLE = "model"
+_GEMINI_ROLES: Dict[MessageRole, str] = {MessageRole.USER: _GEMINI_USER_ROLE}
+
+# GenerationConfig fields copied straight into the Gemini config, with their Gemini names
+_GENERATION_FIELDS = (
+    ("temperature", "temperature"),
+    ("max_tokens", "max_output_tokens"),
+    ("top_p", "top_p"),
+    ("top_k", "top_k"),
+)
+
+# Speaker labels used when flattening a conversation to plain text
+_ROLE_LABELS: Dict[MessageRole, str] = {MessageRole.USER: "User"}
+
+# Flattened conversations keyed by id of their last turn -> (turn count, text), so the
+# next request of a growing conversation only formats the turns added since
+_history_prefixes: LRUCache = LRUCache(maxsize=1024)
+
+# Leading magic bytes of the image formats Gemini accepts
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def sniff_image_mime(image_data: bytes, default: str = "image/jpeg") -> str:
+    """
+    Detect an image MIME type from its leading bytes without decoding it.
+    
+    Args:
+        image_data: Encoded image bytes
+        default: MIME type to use when no signature matches
         
-        # Base system instruction for Mitra AI
-        self.base_system_instruction = """
+    Returns:
+        MIME type string
+    """
+    header = image_data[:12]
+    for signature, mime_type in _IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return mime_type
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return default
+
+
+def _text_parts(content: MessageContent) -> Optional[List[types.Part]]:
+    """Build Gemini parts for a text message, or None if it has no text."""
+    if not content.text:
+        return None
+    return [types.Part.from_text(text=content.text)]
+
+
+def _image_parts(content: MessageContent) -> Optional[List[types.Part]]:
+    """Build Gemini parts for an image message, forwarding the encoded bytes as-is."""
+    if not content.image_data:
+        return None
+    image_part = types.Part.from_bytes(
+        data=content.image_data,
+        mime_type=content.image_mime_type or sniff_image_mime(content.image_data)
+    )
+    if content.text:
+        return [types.Part.from_text(text=content.text), image_part]
+    return [image_part]
+
+
+# Part builders per message type; types without a builder are not sent to Gemini
+_PART_BUILDERS: Dict[MessageType, Callable[[MessageContent], Optional[List[types.Part]]]] = {
+    MessageType.TEXT: _text_parts,
+    MessageType.IMAGE: _image_parts,
+}
+
+
+# Shared persona instruction; {mitra_name} is filled in per user
+_BASE_SYSTEM_INSTRUCTION = textwrap.dedent("""
         You are {mitra_name} (मित्र), a compassionate and empathetic AI companion designed to support 
         the mental wellness of young people in India. Your role is to:
 
@@ -52,7 +195,169 @@ class BaseGeminiService:
 
         Remember: You're here to support, not to solve all problems. Sometimes the best 
         help is just listening and being present.
-        """
+        """).strip()
+
+# Age-appropriate context appended to the system instruction
+_AGE_CONTEXTS: Dict[AgeGroup, str] = {
+    AgeGroup.TEEN: """
+    User Context: You're speaking with a teenager (13-17 years). Be especially:
+    - Understanding of academic pressure and peer relationships
+    - Aware of identity formation challenges
+    - Supportive of their developing independence
+    - Sensitive to family dynamics and expectations
+    - Use relatable examples from school, friendships, and social media
+    """,
+    AgeGroup.YOUNG_ADULT: """
+    User Context: You're speaking with a young adult (18-24 years). Focus on:
+    - Career and education decisions
+    - Relationship and independence issues
+    - Financial stress and future planning
+    - Transitioning to adult responsibilities
+    - Use examples relevant to college, jobs, and life transitions
+    """,
+    AgeGroup.ADULT: """
+    User Context: You're speaking with an adult (25-34 years). Address:
+    - Work-life balance and career growth
+    - Relationship and family planning
+    - Financial stability and responsibilities
+    - Personal goals and life direction
+    - Use examples from professional and personal life
+    """,
+    AgeGroup.MATURE_ADULT: """
+    User Context: You're speaking with a mature adult (35+ years). Consider:
+    - Family and parenting responsibilities
+    - Career advancement and stability
+    - Health and aging concerns
+    - Legacy and life satisfaction
+    - Use examples from established life experiences
+    """
+}
+
+# Problem-specific focus appended to the system instruction
+_PROBLEM_CONTEXTS: Dict[ProblemCategory, str] = {
+    ProblemCategory.STRESS_ANXIETY: """
+    Session Focus: The user is dealing with stress and anxiety. Provide:
+    - Immediate stress relief techniques (breathing, grounding)
+    - Long-term anxiety management strategies
+    - Understanding of stress triggers and responses
+    - Gentle, calming communication style
+    """,
+    ProblemCategory.DEPRESSION_SADNESS: """
+    Session Focus: The user is experiencing depression or sadness. Offer:
+    - Validation of their feelings without minimizing
+    - Small, achievable steps toward improvement
+    - Encouragement to seek professional help if needed
+    - Hope and perspective while being realistic
+    """,
+    ProblemCategory.RELATIONSHIP_ISSUES: """
+    Session Focus: The user has relationship concerns. Help with:
+    - Communication skills and conflict resolution
+    - Boundary setting and self-respect
+    - Understanding relationship dynamics
+    - Cultural considerations for Indian relationships
+    """,
+    ProblemCategory.ACADEMIC_PRESSURE: """
+    Session Focus: The user faces academic pressure. Address:
+    - Study techniques and time management
+    - Dealing with performance anxiety
+    - Balancing expectations with well-being
+    - Understanding the Indian education system pressures
+    """,
+    ProblemCategory.FAMILY_PROBLEMS: """
+    Session Focus: The user has family issues. Consider:
+    - Navigating family expectations and traditions
+    - Intergenerational communication gaps
+    - Balancing personal goals with family duties
+    - Respect for cultural values while asserting needs
+    """
+}
+
+# Drop the source indentation once at import; it would only add prompt tokens
+_AGE_CONTEXTS = {key: textwrap.dedent(block).strip() for key, block in _AGE_CONTEXTS.items()}
+_PROBLEM_CONTEXTS = {key: textwrap.dedent(block).strip() for key, block in _PROBLEM_CONTEXTS.items()}
+
+
+@dataclass(frozen=True)
+class _UserCtx:
+    """Profile fields that shape the system instruction, read once per request."""
+    mitra_name: str = "Mitra"
+    age_group: Optional[AgeGroup] = None
+
+    @classmethod
+    def from_profile(cls, user_profile: Optional[UserProfile]) -> "_UserCtx":
+        """Extract the personalization fields from a profile in one pass."""
+        if not user_profile:
+            return _DEFAULT_USER_CTX
+        preferences = user_profile.preferences
+        return cls(
+            mitra_name=(preferences.mitra_name if preferences else None) or "Mitra",
+            age_group=user_profile.age_group
+        )
+
+
+_DEFAULT_USER_CTX = _UserCtx()
+
+
+@lru_cache(maxsize=2048)
+def _build_system_instruction(
+    base_instruction: str,
+    user_ctx: _UserCtx,
+    problem_category: Optional[ProblemCategory]
+) -> str:
+    """
+    Build the full system instruction for a persona, age group and problem focus.
+    
+    The inputs take few distinct values, so results are cached and repeat
+    requests skip rebuilding the multi-kilobyte instruction text.
+    """
+    parts = [
+        base_instruction.format(mitra_name=user_ctx.mitra_name),
+        _AGE_CONTEXTS.get(user_ctx.age_group, ""),
+        _PROBLEM_CONTEXTS.get(problem_category, "")
+    ]
+    return "\n\n".join(part for part in parts if part)
+
+
+@lru_cache(maxsize=1)
+def get_genai_client() -> "genai.Client":
+    """
+    Return the process-wide Gemini client, creating it on first use.
+    
+    Services are constructed per request and in groups (the composite builds
+    five), so one lazily created client keeps SDK setup and the HTTP/2
+    connection pool off startup and shared across all of them.
+    
+    Returns:
+        Gemini client
+    """
+    from google import genai
+    
+    return genai.Client(
+        api_key=settings.google_api_key,
+        http_options=types.HttpOptions(
+            async_client_args={
+                "http2": True,
+                "limits": httpx.Limits(
+                    max_connections=GEMINI_MAX_CONNECTIONS,
+                    max_keepalive_connections=GEMINI_MAX_KEEPALIVE_CONNECTIONS
+                )
+            }
+        )
+    )
+
+
+class BaseGeminiService:
+    """Base service for common Gemini AI functionality."""
+    
+    def __init__(self):
+        """Initialize Gemini service; the shared client is created on first use."""
+        # Base system instruction for Mitra AI
+        self.base_system_instruction = _BASE_SYSTEM_INSTRUCTION
+
+    @property
+    def client(self) -> "genai.Client":
+        """Process-wide Gemini client shared by every service instance."""
+        return get_genai_client()
 
     def get_personalized_system_instruction(
         self, 
@@ -60,160 +365,247 @@ class BaseGeminiService:
         problem_category: Optional[ProblemCategory] = None
     ) -> str:
         """Get personalized system instruction based on user profile and context."""
+        return _build_system_instruction(
+            self.base_system_instruction, _UserCtx.from_profile(user_profile), problem_category
+        )
+
+    async def generate_content(self, **kwargs) -> Any:
+        """
+        Call the async models.generate_content under the shared concurrency limit.
         
-        # Default values
-        mitra_name = "Mitra"
-        age_context = ""
-        problem_context = ""
+        Rate limiting and server errors are retried with exponential backoff.
         
-        if user_profile:
-            # Use personalized Mitra name
-            if user_profile.preferences and user_profile.preferences.mitra_name:
-                mitra_name = user_profile.preferences.mitra_name
+        Args:
+            **kwargs: Arguments forwarded to models.generate_content
             
-            # Add age-appropriate context
-            if user_profile.age_group:
-                age_contexts = {
-                    AgeGroup.TEEN: """
-                    User Context: You're speaking with a teenager (13-17 years). Be especially:
-                    - Understanding of academic pressure and peer relationships
-                    - Aware of identity formation challenges
-                    - Supportive of their developing independence
-                    - Sensitive to family dynamics and expectations
-                    - Use relatable examples from school, friendships, and social media
-                    """,
-                    AgeGroup.YOUNG_ADULT: """
-                    User Context: You're speaking with a young adult (18-24 years). Focus on:
-                    - Career and education decisions
-                    - Relationship and independence issues
-                    - Financial stress and future planning
-                    - Transitioning to adult responsibilities
-                    - Use examples relevant to college, jobs, and life transitions
-                    """,
-                    AgeGroup.ADULT: """
-                    User Context: You're speaking with an adult (25-34 years). Address:
-                    - Work-life balance and career growth
-                    - Relationship and family planning
-                    - Financial stability and responsibilities
-                    - Personal goals and life direction
-                    - Use examples from professional and personal life
-                    """,
-                    AgeGroup.MATURE_ADULT: """
-                    User Context: You're speaking with a mature adult (35+ years). Consider:
-                    - Family and parenting responsibilities
-                    - Career advancement and stability
-                    - Health and aging concerns
-                    - Legacy and life satisfaction
-                    - Use examples from established life experiences
-                    """
-                }
-                age_context = age_contexts.get(user_profile.age_group, "")
-        
-        # Add problem-specific context
-        if problem_category:
-            problem_contexts = {
-                ProblemCategory.STRESS_ANXIETY: """
-                Session Focus: The user is dealing with stress and anxiety. Provide:
-                - Immediate stress relief techniques (breathing, grounding)
-                - Long-term anxiety management strategies
-                - Understanding of stress triggers and responses
-                - Gentle, calming communication style
-                """,
-                ProblemCategory.DEPRESSION_SADNESS: """
-                Session Focus: The user is experiencing depression or sadness. Offer:
-                - Validation of their feelings without minimizing
-                - Small, achievable steps toward improvement
-                - Encouragement to seek professional help if needed
-                - Hope and perspective while being realistic
-                """,
-                ProblemCategory.RELATIONSHIP_ISSUES: """
-                Session Focus: The user has relationship concerns. Help with:
-                - Communication skills and conflict resolution
-                - Boundary setting and self-respect
-                - Understanding relationship dynamics
-                - Cultural considerations for Indian relationships
-                """,
-                ProblemCategory.ACADEMIC_PRESSURE: """
-                Session Focus: The user faces academic pressure. Address:
-                - Study techniques and time management
-                - Dealing with performance anxiety
-                - Balancing expectations with well-being
-                - Understanding the Indian education system pressures
-                """,
-                ProblemCategory.FAMILY_PROBLEMS: """
-                Session Focus: The user has family issues. Consider:
-                - Navigating family expectations and traditions
-                - Intergenerational communication gaps
-                - Balancing personal goals with family duties
-                - Respect for cultural values while asserting needs
-                """
-            }
-            problem_context = problem_contexts.get(problem_category, "")
-        
-        # Combine all instruction parts
-        full_instruction = self.base_system_instruction.format(mitra_name=mitra_name)
-        if age_context:
-            full_instruction += "\n\n" + age_context
-        if problem_context:
-            full_instruction += "\n\n" + problem_context
+        Returns:
+            Gemini GenerateContentResponse
+        """
+        for attempt in range(1, settings.gemini_max_attempts + 1):
+            try:
+                async with _get_generation_slots():
+                    return await self.client.aio.models.generate_content(**kwargs)
+            except errors.APIError as e:
+                if attempt >= settings.gemini_max_attempts or not _is_retryable(e):
+                    raise
+                await _backoff(attempt, e, "generate_content")
+
+    async def generate_content_stream(self, **kwargs) -> AsyncIterator[List[Any]]:
+        """
+        Stream the async models.generate_content_stream under the shared concurrency limit.
+        
+        A reader task drains the response into a queue. Each yield carries every
+        chunk that has arrived since the previous one, so bursts reach the
+        caller as a single batch without any added wait. Rate limiting and
+        server errors are retried with exponential backoff until the first
+        chunk has been delivered; after that, errors reach the caller.
+        
+        Args:
+            **kwargs: Arguments forwarded to models.generate_content_stream
             
-        return full_instruction
+        Yields:
+            Lists of GenerateContentResponse chunks in arrival order
+        """
+        for attempt in range(1, settings.gemini_max_attempts + 1):
+            started = False
+            try:
+                async for chunks in self._stream_content_once(**kwargs):
+                    started = True
+                    yield chunks
+                return
+            except errors.APIError as e:
+                if started or attempt >= settings.gemini_max_attempts or not _is_retryable(e):
+                    raise
+                await _backoff(attempt, e, "generate_content_stream")
 
-    def _convert_messages_to_gemini_format(self, messages: List[ChatMessage]) -> List[Dict[str, Any]]:
-        """Convert ChatMessage objects to Gemini API format."""
-        gemini_messages = []
+    async def _stream_content_once(self, **kwargs) -> AsyncIterator[List[Any]]:
+        """Single attempt of generate_content_stream, batching chunks as they arrive."""
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
         
-        for message in messages:
-            role = "user" if message.role == MessageRole.USER else "model"
+        async def pump():
+            try:
+                async for chunk in await self.client.aio.models.generate_content_stream(**kwargs):
+                    queue.put_nowait(chunk)
+            except Exception as e:
+                queue.put_nowait(e)
+            finally:
+                queue.put_nowait(done)
+        
+        async with _get_generation_slots():
+            reader = asyncio.create_task(pump())
+            try:
+                finished = False
+                while not finished:
+                    batch = [await queue.get()]
+                    while not queue.empty():
+                        batch.append(queue.get_nowait())
+                    
+                    chunks = []
+                    error = None
+                    for item in batch:
+                        if item is done:
+                            finished = True
+                        elif isinstance(item, Exception):
+                            error = item
+                        else:
+                            chunks.append(item)
+                    # Hand over chunks that arrived before a failure so none are lost
+                    if chunks:
+                        yield chunks
+                    if error is not None:
+                        raise error
+            finally:
+                # Stop reading if the caller abandons the stream early
+                reader.cancel()
+
+    async def get_cached_instruction(self, system_instruction: str, model: str) -> Optional[str]:
+        """
+        Get a provider-side cache handle for a system instruction.
+        
+        Handles are shared across users with the same persona and recreated
+        shortly before they expire. Instructions the provider refuses to cache
+        (e.g. below the minimum token count) are remembered for one TTL so the
+        create call is not retried on every request. Concurrent misses for the
+        same key wait on one create call instead of each creating a billed cache.
+        
+        Args:
+            system_instruction: Full system instruction text
+            model: Model the cache is created for
+            
+        Returns:
+            Cached content name, or None to send the instruction inline
+        """
+        key = (model, system_instruction)
+        name = _instruction_caches.get(key, _NOT_CACHED)
+        if name is not _NOT_CACHED:
+            return name
+        
+        lock = _instruction_cache_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            try:
+                # Another request may have created the cache while this one waited
+                name = _instruction_caches.get(key, _NOT_CACHED)
+                if name is not _NOT_CACHED:
+                    return name
+                
+                name = None
+                try:
+                    cache = await self.client.aio.caches.create(
+                        model=model,
+                        config=types.CreateCachedContentConfig(
+                            system_instruction=system_instruction,
+                            ttl=f"{INSTRUCTION_CACHE_TTL_SECONDS}s"
+                        )
+                    )
+                    name = cache.name
+                except Exception as e:
+                    logger.debug("System instruction not cached: %s", e)
+                
+                _instruction_caches[key] = name
+                return name
+            finally:
+                # Requests already waiting hold the lock object; later ones hit the cache
+                if _instruction_cache_locks.get(key) is lock:
+                    del _instruction_cache_locks[key]
+
+    async def get_instruction_config(self, system_instruction: str, model: str) -> Dict[str, Any]:
+        """
+        Get the GenerateContentConfig fields that carry a system instruction.
+        
+        Args:
+            system_instruction: Full system instruction text
+            model: Model the request is sent to
+            
+        Returns:
+            Either cached_content for a provider-side cached instruction or the inline system_instruction
+        """
+        cached_instruction = await self.get_cached_instruction(system_instruction, model)
+        if cached_instruction:
+            return {"cached_content": cached_instruction}
+        return {"system_instruction": system_instruction}
+
+    async def get_generation_config(self, system_instruction: str, model: str, **overrides) -> types.GenerateContentConfig:
+        """
+        Get a GenerateContentConfig carrying a system instruction, plus per-call overrides.
+        
+        The instruction-bearing base config is built once per (model, instruction,
+        cache handle) and reused; overrides are applied to a shallow copy so the
+        shared base is never mutated.
+        
+        Args:
+            system_instruction: Full system instruction text
+            model: Model the request is sent to
+            **overrides: Extra config fields for this call (temperature, response_schema, ...)
             
-            # Convert content based on type
-            if message.type == MessageType.TEXT and message.content.text:
-                gemini_messages.append({
-                    "role": role,
-                    "parts": [{"text": message.content.text}]
-                })
-            elif message.type == MessageType.IMAGE and message.content.image_data:
-                # Convert image data to PIL Image
-                image = Image.open(io.BytesIO(message.content.image_data))
-                parts = []
-                if message.content.text:
-                    parts.append({"text": message.content.text})
-                parts.append(image)
-                gemini_messages.append({
-                    "role": role,
-                    "parts": parts
-                })
-        
-        return gemini_messages
+        Returns:
+            Generation config for the call
+        """
+        instruction_config = await self.get_instruction_config(system_instruction, model)
+        key = (model, system_instruction, instruction_config.get("cached_content"))
+        base_config = _base_configs.get(key)
+        if base_config is None:
+            base_config = types.GenerateContentConfig(**instruction_config)
+            _base_configs[key] = base_config
+        return base_config.model_copy(update=overrides) if overrides else base_config
+
+    def _convert_messages_to_gemini_format(self, messages: List[ChatMessage]) -> List[types.Content]:
+        """Convert ChatMessage objects to Gemini API format."""
+        roles = _GEMINI_ROLES
+        builders = _PART_BUILDERS
+        
+        # Typed Content skips the SDK's dict conversion; messages with nothing to send are dropped
+        return [
+            types.Content(role=roles.get(message.role, _GEMINI_MODEL_ROLE), parts=parts)
+            for message in messages
+            if (build := builders.get(message.type)) and (parts := build(message.content))
+        ]
 
     def _convert_messages_to_text(self, messages: List[ChatMessage]) -> str:
         """Convert messages to plain text format."""
-        text_parts = []
+        if not messages:
+            return ""
         
-        for message in messages:
-            role_prefix = "User" if message.role == MessageRole.USER else "Assistant"
-            if message.content.text:
-                text_parts.append(f"{role_prefix}: {message.content.text}")
+        # Find the latest turn a previous call ended on and extend its text
+        prefix, start = "", 0
+        for index in range(len(messages) - 1, -1, -1):
+            entry = _history_prefixes.get(messages[index].id)
+            if entry and entry[0] == index + 1:
+                prefix, start = entry[1], index + 1
+                break
         
-        return "\n\n".join(text_parts)
+        new_text = self._join_turns(messages[start:])
+        text = "\n\n".join(part for part in (prefix, new_text) if part)
+        # Only the newest entry is kept per conversation; older prefixes are never extended again
+        if start:
+            _history_prefixes.pop(messages[start - 1].id, None)
+        _history_prefixes[messages[-1].id] = (len(messages), text)
+        return text
+
+    @staticmethod
+    def _join_turns(messages: List[ChatMessage]) -> str:
+        """Render turns as speaker-labelled paragraphs, skipping turns without text."""
+        labels = _ROLE_LABELS
+        return "\n\n".join(
+            f"{labels.get(message.role, 'Assistant')}: {message.content.text}"
+            for message in messages
+            if message.content.text
+        )
 
     def _prepare_generation_config(self, config: Optional[GenerationConfig]) -> Dict[str, Any]:
         """Prepare generation configuration for Gemini API."""
-        gen_config = {}
-        
-        if config:
-            if config.temperature is not None:
-                gen_config["temperature"] = config.temperature
-            if config.max_tokens is not None:
-                gen_config["max_output_tokens"] = config.max_tokens
-            if config.top_p is not None:
-                gen_config["top_p"] = config.top_p
-            if config.top_k is not None:
-                gen_config["top_k"] = config.top_k
-            if config.thinking_budget is not None:
-                gen_config["thinking_config"] = types.ThinkingConfig(
-                    thinking_budget=config.thinking_budget
-                )
+        if not config:
+            return {}
+        
+        gen_config = {
+            gemini_field: value
+            for field, gemini_field in _GENERATION_FIELDS
+            if (value := getattr(config, field)) is not None
+        }
+        if config.thinking_budget is not None:
+            gen_config["thinking_config"] = types.ThinkingConfig(
+                thinking_budget=config.thinking_budget
+            )
         
         return gen_config
 
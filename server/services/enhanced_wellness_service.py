@@ -3,6 +3,7 @@ Enhanced wellness service with MCP integration for generating contextual resourc
 """
 
 import logging
+import re
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
@@ -13,6 +14,22 @@ from services.resource_generation_service import ResourceGenerationService
 
 logger = logging.getLogger(__name__)
 
+# Urgency indicators, split into single words (matched by token lookup) and
+# multi-word phrases (matched on the space-joined token stream)
+_HIGH_URGENCY_WORDS = frozenset({
+    'crisis', 'emergency', 'urgent', 'overwhelming', 'desperate'
+})
+_HIGH_URGENCY_PHRASES = (
+    "can't cope", 'breaking down', "can't handle", 'help me now'
+)
+_MEDIUM_URGENCY_WORDS = frozenset({
+    'stressed', 'anxious', 'worried', 'confused', 'stuck'
+})
+_MEDIUM_URGENCY_PHRASES = (
+    "don't know what to do", 'need help', 'feeling bad'
+)
+_TOKEN_PATTERN = re.compile(r"[a-z']+")
+
 
 class EnhancedWellnessService:
     """Enhanced wellness service with MCP integration capabilities."""
@@ -123,23 +140,15 @@ class EnhancedWellnessService:
 
     def _assess_message_urgency(self, message: str) -> str:
         """Assess the urgency level of a user message."""
-        message_lower = message.lower()
-
-        # High urgency indicators
-        high_urgency_words = [
-            'crisis', 'emergency', 'urgent', 'can\'t cope', 'breaking down',
-            'overwhelming', 'can\'t handle', 'desperate', 'help me now'
-        ]
-
-        # Medium urgency indicators
-        medium_urgency_words = [
-            'stressed', 'anxious', 'worried', 'confused', 'stuck',
-            'don\'t know what to do', 'need help', 'feeling bad'
-        ]
+        tokens = _TOKEN_PATTERN.findall(message.lower())
+        # Pad with spaces so phrase checks only match on whole words
+        joined = f" {' '.join(tokens)} "
 
-        if any(word in message_lower for word in high_urgency_words):
+        if (not _HIGH_URGENCY_WORDS.isdisjoint(tokens)
+                or any(f" {phrase} " in joined for phrase in _HIGH_URGENCY_PHRASES)):
             return "high"
-        elif any(word in message_lower for word in medium_urgency_words):
+        elif (not _MEDIUM_URGENCY_WORDS.isdisjoint(tokens)
+                or any(f" {phrase} " in joined for phrase in _MEDIUM_URGENCY_PHRASES)):
             return "medium"
         else:
             return "low"
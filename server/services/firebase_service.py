@@ -2,21 +2,523 @@
 Firebase service for authentication and Firestore operations.
 """
 
+import asyncio
+import functools
+import hashlib
+import io
 import logging
-from typing import Optional, Dict, Any, List
-from datetime import datetime
-import json
+import re
+import time
+from typing import Optional, Dict, Any, List, Tuple, Callable, AsyncIterator, Union, BinaryIO
+from datetime import datetime, date, timezone
+from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 import os
+from urllib.parse import quote
+
+import httpx
+import jwt
+import orjson
+from cachetools import TTLCache
+from cryptography import x509
+from google.api_core.exceptions import Aborted, FailedPrecondition, NotFound
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud import storage as gcs
+from requests.adapters import HTTPAdapter
 
 # Firebase Admin SDK imports
 import firebase_admin
-from firebase_admin import credentials, auth, firestore, storage, exceptions
+from firebase_admin import credentials, auth, firestore, firestore_async, exceptions
 
 from core.config import settings
 from models.user import UserProfile, UserProvider, UserStatus, UserPreferences
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of writes Firestore accepts in a single batch commit
+FIRESTORE_BATCH_LIMIT = 500
+# Retries for batch_write chunks aborted by contention
+BATCH_WRITE_MAX_RETRIES = 3
+# Attempts per document before delete_user_data and bulk writes give up on it
+BULK_DELETE_MAX_ATTEMPTS = 5
+# batch_write switches to a BulkWriter above this many operations
+BULK_WRITE_THRESHOLD = 5000
+# Chunk size for resumable Cloud Storage uploads (must be a multiple of 256 KiB)
+STORAGE_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+# Default Cache-Control per storage path prefix. Mitra profile images are
+# written once per companion name but not content-addressed, so they are
+# cached for a day rather than marked immutable.
+STORAGE_CACHE_CONTROL = {
+    'mitra_profiles/': 'public, max-age=86400',
+}
+
+# Dedicated pool for blocking Firestore and Firebase Auth calls so they do not contend with the default executor
+_firestore_pool = ThreadPoolExecutor(max_workers=40, thread_name_prefix='fs')
+
+
+async def _run_in_pool(fn, *args, **kwargs):
+    """Run a blocking Firestore or Firebase Auth call on the dedicated Firestore thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_firestore_pool, functools.partial(fn, *args, **kwargs))
+
+
+# Separate pool for blocking Cloud Storage calls; uploads and downloads can be
+# long-running and must not starve Firestore calls of workers
+STORAGE_POOL_WORKERS = 16
+_storage_pool = ThreadPoolExecutor(max_workers=STORAGE_POOL_WORKERS, thread_name_prefix='gcs')
+
+
+async def _run_in_storage_pool(fn, *args, **kwargs):
+    """Run a blocking Cloud Storage call on the dedicated storage thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_storage_pool, functools.partial(fn, *args, **kwargs))
+
+
+# Log descriptions for Firebase error classes, looked up along the error's MRO
+_ERROR_DESCRIPTIONS: Dict[type, str] = {
+    exceptions.InvalidArgumentError: "Invalid arguments",
+    exceptions.NotFoundError: "Resource not found",
+    exceptions.AlreadyExistsError: "Resource already exists",
+    exceptions.PermissionDeniedError: "Permission denied",
+    exceptions.UnauthenticatedError: "Unauthenticated",
+    exceptions.ResourceExhaustedError: "Resource exhausted/quota exceeded",
+    exceptions.FailedPreconditionError: "Failed precondition",
+    exceptions.AbortedError: "Operation aborted",
+    exceptions.OutOfRangeError: "Out of range",
+    exceptions.UnimplementedError: "Unimplemented",
+    exceptions.InternalError: "Internal error",
+    exceptions.UnavailableError: "Service unavailable",
+    exceptions.DataLossError: "Data loss",
+    exceptions.FirebaseError: "Firebase error",
+}
+
+# Per-type encoders for _fs_encode, resolved once per type
+_FS_ENCODERS: Dict[type, Callable[[Any], Any]] = {}
+
+
+def _fs_encoder(value_type: type) -> Callable[[Any], Any]:
+    """Resolve and cache the encoder for a Python type."""
+    encoder = _FS_ENCODERS.get(value_type)
+    if encoder is None:
+        if issubclass(value_type, dict):
+            encoder = lambda value: {key: _fs_encode(item) for key, item in value.items()}
+        elif issubclass(value_type, (list, tuple)):
+            encoder = lambda value: [_fs_encode(item) for item in value]
+        elif issubclass(value_type, Enum):
+            encoder = lambda value: value.value
+        elif issubclass(value_type, date) and not issubclass(value_type, datetime):
+            # Firestore stores timestamps only, not calendar dates
+            encoder = lambda value: datetime(value.year, value.month, value.day)
+        else:
+            encoder = lambda value: value
+        _FS_ENCODERS[value_type] = encoder
+    return encoder
+
+
+def _fs_encode(value: Any) -> Any:
+    """
+    Convert a value to types the Firestore SDK stores directly.
+    
+    Enums become their values and dates become midnight datetimes; datetimes
+    are left as is since the SDK encodes them natively without precision loss.
+    
+    Args:
+        value: Document data or a nested value
+        
+    Returns:
+        Encoded copy of the value
+    """
+    return _fs_encoder(type(value))(value)
+
+
+# Verified ID token claims keyed by token digest; shared across service instances
+_token_cache: TTLCache = TTLCache(maxsize=10000, ttl=30)
+
+# Google's public certificates for Firebase ID tokens
+FIREBASE_CERTS_URL = 'https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com'
+# Fallback lifetime when the certificate response has no Cache-Control max-age
+FIREBASE_CERTS_TTL = 6 * 60 * 60
+
+_MAX_AGE_PATTERN = re.compile(r'max-age=(\d+)')
+
+# Parsed RSA public keys keyed by kid, valid until _certs_expires_at
+_certs: Optional[Dict[str, Any]] = None
+_certs_expires_at = 0.0
+_certs_lock = asyncio.Lock()
+
+
+async def refresh_firebase_certs(force: bool = False) -> Dict[str, Any]:
+    """
+    Return Google's Firebase token signing keys, fetching them when expired.
+    
+    Keys are cached for the max-age advertised by Google's Cache-Control header.
+    
+    Args:
+        force: Fetch even if the cached keys are still fresh
+        
+    Returns:
+        Mapping of key id to RSA public key
+    """
+    global _certs, _certs_expires_at
+    if not force and _certs is not None and time.monotonic() < _certs_expires_at:
+        return _certs
+    async with _certs_lock:
+        if force or _certs is None or time.monotonic() >= _certs_expires_at:
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await client.get(FIREBASE_CERTS_URL)
+                response.raise_for_status()
+            max_age = _MAX_AGE_PATTERN.search(response.headers.get('cache-control', ''))
+            ttl = int(max_age.group(1)) if max_age else FIREBASE_CERTS_TTL
+            
+            _certs = {
+                kid: x509.load_pem_x509_certificate(pem.encode()).public_key()
+                for kid, pem in response.json().items()
+            }
+            _certs_expires_at = time.monotonic() + ttl
+            logger.info("Fetched %s Firebase token certificates, valid for %ss", len(_certs), ttl)
+    return _certs
+
+
+async def keep_firebase_certs_fresh() -> None:
+    """Preload the token signing keys, then refresh them shortly before they expire."""
+    while True:
+        try:
+            await refresh_firebase_certs(force=True)
+            delay = max(60.0, _certs_expires_at - time.monotonic() - 60)
+        except Exception as e:
+            logger.warning("Failed to refresh Firebase token certificates: %s", e)
+            delay = 60.0
+        await asyncio.sleep(delay)
+
+
+def _decode_firebase_token(id_token: str, key: Any) -> Dict[str, Any]:
+    """Verify a Firebase ID token's RS256 signature and claims and return the claims."""
+    project_id = settings.firebase_project_id
+    claims = jwt.decode(
+        id_token,
+        key,
+        algorithms=['RS256'],
+        audience=project_id,
+        issuer=f"https://securetoken.google.com/{project_id}",
+        options={'require': ['exp', 'iat', 'sub']}
+    )
+    if not claims['sub']:
+        raise jwt.InvalidTokenError("Token has an empty subject")
+    claims['uid'] = claims['sub']
+    return claims
+
+
+# Recently read user profiles keyed by uid, invalidated on every user document write
+_user_cache: TTLCache = TTLCache(maxsize=5000, ttl=60)
+# Firebase Auth user lookups keyed by ('uid', uid) or ('email', email)
+_auth_user_cache: TTLCache = TTLCache(maxsize=10000, ttl=60)
+# Recently confirmed missing Auth users, kept briefly to absorb repeated misses
+_auth_user_missing: TTLCache = TTLCache(maxsize=10000, ttl=5)
+_auth_inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+# In-flight user document reads; concurrent callers for a uid share one read
+_user_inflight: Dict[str, asyncio.Future] = {}
+
+
+async def _single_flight(inflight: Dict[Any, asyncio.Future], key: Any, load: Callable) -> Any:
+    """
+    Run load() once for concurrent callers with the same key.
+    
+    The first caller starts the load and registers its future in inflight;
+    callers arriving before it completes await the same future. The entry is
+    removed as soon as the load finishes, so later calls start a fresh load.
+    
+    Args:
+        inflight: Registry of in-flight futures for this kind of load
+        key: Identity of the load
+        load: Zero-argument callable returning a coroutine
+        
+    Returns:
+        Result of the shared load
+    """
+    future = inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(load())
+        inflight[key] = future
+        future.add_done_callback(
+            lambda done: inflight.pop(key, None) if inflight.get(key) is done else None
+        )
+    # Shield so one cancelled caller does not cancel the load for the others
+    return await asyncio.shield(future)
+
+# Public URLs of storage objects known to exist, keyed by path; lets
+# get_file_public_url(verify=True) skip the existence request
+_public_url_cache: TTLCache = TTLCache(maxsize=4096, ttl=3600)
+
+# Seconds a fully healthy health_check result is reused
+HEALTH_CHECK_TTL = 5
+_health_cache: TTLCache = TTLCache(maxsize=1, ttl=HEALTH_CHECK_TTL)
+
+
+class _WriteCoalescer:
+    """
+    Collect document writes for a short window and commit them as one batch.
+    
+    Callers await their own write, so read-after-write still holds; bursts of
+    saves (mood edits, journal autosaves) share a single commit RPC.
+    """
+    
+    def __init__(self, max_delay: float = 0.05, max_ops: int = 400, max_retries: int = 3):
+        self.max_delay = max_delay
+        self.max_ops = max_ops
+        self.max_retries = max_retries
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop = None
+    
+    async def submit(self, db, doc_ref, data: Dict[str, Any]) -> None:
+        """Queue a set() of data on doc_ref and wait until it is committed."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run(db))
+        future = loop.create_future()
+        await self._queue.put((doc_ref, data, future))
+        await future
+    
+    async def _run(self, db) -> None:
+        """Drain the queue, committing each window of writes as one batch."""
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(pending) < self.max_ops:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                error = await self._commit(db, pending)
+            except Exception as e:
+                # Never let one window kill the drain task and strand later callers
+                logger.error(f"Error committing coalesced writes: {e}")
+                error = e
+            for _, _, future in pending:
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+    
+    async def _commit(self, db, pending: List[tuple]) -> Optional[Exception]:
+        """
+        Commit pending writes, retrying with exponential backoff on Aborted.
+        
+        A write that cannot be encoded fails only its own caller and is left
+        out of the batch, so one bad document does not fail the whole window.
+        """
+        batch = db.batch()
+        queued = 0
+        for doc_ref, data, future in pending:
+            try:
+                batch.set(doc_ref, data)
+                queued += 1
+            except Exception as e:
+                logger.error(f"Rejected coalesced write to {doc_ref.path}: {e}")
+                if not future.done():
+                    future.set_exception(e)
+        if not queued:
+            return None
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                await _run_in_pool(batch.commit)
+                logger.debug("Committed %s coalesced writes", queued)
+                return None
+            except Aborted as e:
+                if attempt == self.max_retries:
+                    return e
+                await asyncio.sleep(0.05 * (2 ** attempt))
+            except Exception as e:
+                return e
+
+
+_write_coalescer = _WriteCoalescer()
+
+
+class _AdaptiveBatchSize:
+    """
+    Chunk size for batch_write that adapts to contention, like TCP slow start.
+    
+    Starts at Firestore's batch limit, halves when a commit is aborted and
+    doubles back after a run of successful commits.
+    """
+    
+    def __init__(self, initial: int = FIRESTORE_BATCH_LIMIT, minimum: int = 10,
+                 maximum: int = FIRESTORE_BATCH_LIMIT, grow_after: int = 10):
+        self.size = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.grow_after = grow_after
+        self._successes = 0
+    
+    def record_success(self) -> None:
+        self._successes += 1
+        if self._successes >= self.grow_after:
+            self.size = min(self.maximum, self.size * 2)
+            self._successes = 0
+    
+    def record_aborted(self) -> None:
+        self.size = max(self.minimum, self.size // 2)
+        self._successes = 0
+
+
+_batch_size = _AdaptiveBatchSize()
+
+
+def _group_writes_by_document(writes: List[tuple]) -> List[List[tuple]]:
+    """Group (type, doc_ref, data) writes by document path, in order of first appearance."""
+    groups: Dict[str, List[tuple]] = {}
+    for write in writes:
+        groups.setdefault(write[1].path, []).append(write)
+    return list(groups.values())
+
+# Shared Firestore clients; their gRPC channel pools are safe for concurrent use
+_db = None
+_async_db = None
+
+
+def get_db():
+    """
+    Return the process-wide Firestore client, creating it on first use.
+    
+    Requires the Firebase app to be initialized (see FirebaseService).
+    
+    Returns:
+        Firestore client
+    """
+    global _db
+    if _db is None:
+        _db = firestore.client()
+    return _db
+
+
+def get_async_db():
+    """
+    Return the process-wide async Firestore client, creating it on first use.
+    
+    Used for request-path reads and writes so they run as coroutines on the
+    event loop; batch, BulkWriter and transaction paths keep the sync client.
+    
+    Returns:
+        Firestore AsyncClient
+    """
+    global _async_db
+    if _async_db is None:
+        _async_db = firestore_async.client()
+    return _async_db
+
+
+@functools.lru_cache(maxsize=1)
+def get_storage_bucket():
+    """
+    Return the process-wide default Cloud Storage bucket, creating it on first use.
+    
+    The client uses one authorized HTTP session whose connection pool is as
+    large as the storage thread pool, so concurrent uploads and downloads
+    reuse kept-alive connections instead of opening new TLS connections
+    (the default pool keeps only 10).
+    
+    Returns:
+        Storage bucket
+    """
+    app = firebase_admin.get_app()
+    credential = app.credential.get_credential()
+    session = AuthorizedSession(credential)
+    session.mount('https://', HTTPAdapter(pool_maxsize=STORAGE_POOL_WORKERS))
+    client = gcs.Client(project=app.project_id, credentials=credential, _http=session)
+    return client.bucket(app.options.get('storageBucket'))
+
+
+def _default_cache_control(file_path: str) -> Optional[str]:
+    """Return the Cache-Control header configured for a storage path prefix."""
+    for prefix, cache_control in STORAGE_CACHE_CONTROL.items():
+        if file_path.startswith(prefix):
+            return cache_control
+    return None
+
+
+# Per-user subcollections stored under users/{uid}
+USER_COLLECTIONS = ('chat_sessions', 'mood_entries', 'journal_entries', 'meditation_sessions')
+
+
+def _build_user_refs(db, uid: str) -> Dict[str, Any]:
+    """Build references to a user's document and subcollections on a client."""
+    user_doc = db.collection('users').document(uid)
+    refs = {name: user_doc.collection(name) for name in USER_COLLECTIONS}
+    refs['doc'] = user_doc
+    return refs
+
+
+@functools.lru_cache(maxsize=2048)
+def _user_refs(uid: str) -> Dict[str, Any]:
+    """
+    Return cached sync-client references to a user's document and subcollections.
+    
+    References are plain paths, so they stay valid after the data is deleted.
+    
+    Args:
+        uid: User ID
+        
+    Returns:
+        Mapping of 'doc' and each name in USER_COLLECTIONS to its reference
+    """
+    return _build_user_refs(get_db(), uid)
+
+
+@functools.lru_cache(maxsize=2048)
+def _user_async_refs(uid: str) -> Dict[str, Any]:
+    """Return cached async-client references, shaped like _user_refs."""
+    return _build_user_refs(get_async_db(), uid)
+
+
+def _projection(fields: Optional[List[str]], order_field: str) -> Optional[Tuple[str, ...]]:
+    """Normalize requested fields to a hashable projection that keeps id and the sort field."""
+    if not fields:
+        return None
+    return tuple(sorted({'id', order_field, *fields}))
+
+
+@functools.lru_cache(maxsize=2048)
+def _newest_first_query(
+    uid: str,
+    collection_name: str,
+    order_field: str,
+    limit: int,
+    fields: Optional[Tuple[str, ...]] = None
+):
+    """
+    Return a cached query for the newest documents of a user subcollection.
+    
+    Queries are immutable, so the built query is reused across requests and
+    cursors are applied on top of it per call.
+    
+    Args:
+        uid: User ID
+        collection_name: Name from USER_COLLECTIONS
+        order_field: Field ordered descending
+        limit: Maximum number of documents
+        fields: Field projection, or None for whole documents
+        
+    Returns:
+        Firestore query
+    """
+    query = _user_async_refs(uid)[collection_name]
+    if fields is not None:
+        query = query.select(fields)
+    return query.order_by(order_field, direction=firestore.Query.DESCENDING).limit(limit)
+
 
 class FirebaseService:
     """Service for Firebase Authentication and Firestore operations."""
@@ -37,16 +539,16 @@ class FirebaseService:
             # Method 1: Try to use service account key from environment variable (for Cloud Run)
             if os.getenv('FIREBASE_SERVICE_ACCOUNT_KEY'):
                 try:
-                    service_account_info = json.loads(os.getenv('FIREBASE_SERVICE_ACCOUNT_KEY'))
+                    service_account_info = orjson.loads(os.getenv('FIREBASE_SERVICE_ACCOUNT_KEY'))
                     cred = credentials.Certificate(service_account_info)
                     logger.info("Firebase initialized with service account from environment variable")
                 except Exception as e:
-                    logger.error(f"Failed to parse FIREBASE_SERVICE_ACCOUNT_KEY: {e}")
+                    logger.error("Failed to parse FIREBASE_SERVICE_ACCOUNT_KEY: %s", e)
             
             # Method 2: Try to use service account credentials file
             elif settings.firebase_credentials_path and os.path.exists(settings.firebase_credentials_path):
                 cred = credentials.Certificate(settings.firebase_credentials_path)
-                logger.info(f"Firebase initialized with service account from {settings.firebase_credentials_path}")
+                logger.info("Firebase initialized with service account from %s", settings.firebase_credentials_path)
             
             # Method 3: Use default credentials (for Cloud Run, GCE, etc.)
             elif settings.firebase_project_id:
@@ -54,7 +556,7 @@ class FirebaseService:
                     cred = credentials.ApplicationDefault()
                     logger.info("Firebase initialized with application default credentials")
                 except Exception as e:
-                    logger.error(f"Failed to initialize Firebase with default credentials: {e}")
+                    logger.error("Failed to initialize Firebase with default credentials: %s", e)
                     # Fall back to empty credentials for Cloud Run
                     cred = credentials.ApplicationDefault()
             
@@ -70,10 +572,50 @@ class FirebaseService:
         
         # Initialize Firebase services
         self.auth = auth
-        self.db = firestore.client()
-        self.storage_bucket = storage.bucket()
+        self.db = get_db()
+        self.async_db = get_async_db()
+        self.storage_bucket = get_storage_bucket()
         logger.info("Firebase services initialized successfully")
 
+    async def _set_document(
+        self,
+        doc_ref,
+        data: Dict[str, Any],
+        coalesce: bool = False
+    ) -> None:
+        """
+        Write a document, either on its own or batched with concurrent writes.
+        
+        Args:
+            doc_ref: Firestore document reference
+            data: Document data
+            coalesce: Commit together with other writes issued in the same short
+                window; returns once the shared batch is committed.
+        """
+        data = _fs_encode(data)
+        if coalesce:
+            await _write_coalescer.submit(self.db, doc_ref, data)
+        else:
+            await self.async_db.document(doc_ref.path).set(data)
+
+    @staticmethod
+    async def _read_query_page(query) -> Tuple[List[Dict[str, Any]], Optional[Any]]:
+        """
+        Stream a query and return its documents with the last snapshot as cursor.
+        
+        Args:
+            query: Firestore query to run
+            
+        Returns:
+            Tuple of (document dicts, last document snapshot or None)
+        """
+        entries = []
+        last_snapshot = None
+        async for doc in query.stream():
+            entries.append(doc.to_dict())
+            last_snapshot = doc
+        return entries, last_snapshot
+
     def _handle_firebase_error(self, error: Exception, operation: str) -> None:
         """
         Centralized Firebase error handling and logging.
@@ -82,49 +624,61 @@ class FirebaseService:
             error: The exception that occurred
             operation: Description of the operation that failed
         """
-        if isinstance(error, exceptions.InvalidArgumentError):
-            logger.error(f"{operation} failed: Invalid arguments - {error}")
-        elif isinstance(error, exceptions.NotFoundError):
-            logger.error(f"{operation} failed: Resource not found - {error}")
-        elif isinstance(error, exceptions.AlreadyExistsError):
-            logger.error(f"{operation} failed: Resource already exists - {error}")
-        elif isinstance(error, exceptions.PermissionDeniedError):
-            logger.error(f"{operation} failed: Permission denied - {error}")
-        elif isinstance(error, exceptions.UnauthenticatedError):
-            logger.error(f"{operation} failed: Unauthenticated - {error}")
-        elif isinstance(error, exceptions.ResourceExhaustedError):
-            logger.error(f"{operation} failed: Resource exhausted/quota exceeded - {error}")
-        elif isinstance(error, exceptions.FailedPreconditionError):
-            logger.error(f"{operation} failed: Failed precondition - {error}")
-        elif isinstance(error, exceptions.AbortedError):
-            logger.error(f"{operation} failed: Operation aborted - {error}")
-        elif isinstance(error, exceptions.OutOfRangeError):
-            logger.error(f"{operation} failed: Out of range - {error}")
-        elif isinstance(error, exceptions.UnimplementedError):
-            logger.error(f"{operation} failed: Unimplemented - {error}")
-        elif isinstance(error, exceptions.InternalError):
-            logger.error(f"{operation} failed: Internal error - {error}")
-        elif isinstance(error, exceptions.UnavailableError):
-            logger.error(f"{operation} failed: Service unavailable - {error}")
-        elif isinstance(error, exceptions.DataLossError):
-            logger.error(f"{operation} failed: Data loss - {error}")
-        elif isinstance(error, exceptions.FirebaseError):
-            logger.error(f"{operation} failed: Firebase error - {error}")
+        # Most specific registered class wins, as with the isinstance chain it replaces
+        for error_cls in type(error).__mro__:
+            description = _ERROR_DESCRIPTIONS.get(error_cls)
+            if description is not None:
+                break
         else:
-            logger.error(f"{operation} failed: Unexpected error - {error}")
+            description = "Unexpected error"
+        logger.error("%s failed: %s - %s", operation, description, error)
+
+    async def warm_up(self) -> None:
+        """
+        Open the Firestore channels and fetch an access token ahead of traffic.
+        
+        The first RPC after startup pays for the TLS handshake and credential
+        fetch; running cheap calls here keeps that off the first user request.
+        Failures are logged and otherwise ignored.
+        """
+        async def read_async():
+            async for _ in self.async_db.collection('_warmup').limit(1).stream():
+                pass
+        
+        def read_sync():
+            list(self.db.collection('_warmup').limit(1).stream())
+        
+        started = time.monotonic()
+        results = await asyncio.gather(
+            read_async(),
+            _run_in_pool(read_sync),
+            _run_in_pool(firebase_admin.get_app().credential.get_access_token),
+            return_exceptions=True
+        )
+        for name, result in zip(('async Firestore', 'Firestore', 'credential'), results):
+            if isinstance(result, Exception):
+                logger.warning("Firebase warm-up of %s failed: %s", name, result)
+        logger.info("Firebase warm-up finished in %.0fms", (time.monotonic() - started) * 1000)
 
     async def health_check(self) -> Dict[str, Any]:
         """
         Perform a health check on Firebase services.
         
+        A fully healthy result is reused for HEALTH_CHECK_TTL seconds so
+        frequent probes do not each cost an Auth and a Firestore RPC.
+        
         Returns:
             Dictionary with service status information
         """
+        cached_status = _health_cache.get('status')
+        if cached_status is not None:
+            return cached_status
+        
         health_status = {
             "firebase_admin": False,
             "auth": False,
             "firestore": False,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
             "errors": []
         }
         
@@ -135,36 +689,113 @@ class FirebaseService:
         except Exception as e:
             health_status["errors"].append(f"Firebase Admin: {str(e)}")
         
-        try:
-            # Test Auth service
-            if self.auth:
-                # Try to get a non-existent user (this tests auth connectivity)
-                try:
-                    self.auth.get_user("health-check-non-existent-user")
-                except exceptions.UserNotFoundError:
-                    # This is expected and means auth is working
-                    health_status["auth"] = True
-                except Exception as e:
-                    health_status["errors"].append(f"Auth service: {str(e)}")
-            else:
-                health_status["errors"].append("Auth service not initialized")
-        except Exception as e:
-            health_status["errors"].append(f"Auth check: {str(e)}")
+        def check_auth():
+            # Try to get a non-existent user (this tests auth connectivity)
+            try:
+                self.auth.get_user("health-check-non-existent-user")
+            except exceptions.UserNotFoundError:
+                # This is expected and means auth is working
+                return
         
-        try:
-            # Test Firestore service
-            if self.db:
-                # Try to read from a collection (minimal operation)
-                collection_ref = self.db.collection('health-check')
-                list(collection_ref.limit(1).stream())
-                health_status["firestore"] = True
+        def check_firestore():
+            # Try to read from a collection (minimal operation)
+            list(self.db.collection('health-check').limit(1).stream())
+        
+        # Run both probes concurrently rather than one after the other
+        probes = {}
+        if self.auth:
+            probes["auth"] = _run_in_pool(check_auth)
+        else:
+            health_status["errors"].append("Auth service not initialized")
+        if self.db:
+            probes["firestore"] = _run_in_pool(check_firestore)
+        else:
+            health_status["errors"].append("Firestore service not initialized")
+        
+        results = await asyncio.gather(*probes.values(), return_exceptions=True)
+        for name, result in zip(probes, results):
+            if isinstance(result, Exception):
+                label = "Auth service" if name == "auth" else "Firestore service"
+                health_status["errors"].append(f"{label}: {str(result)}")
             else:
-                health_status["errors"].append("Firestore service not initialized")
-        except Exception as e:
-            health_status["errors"].append(f"Firestore service: {str(e)}")
+                health_status[name] = True
         
+        if not health_status["errors"]:
+            _health_cache['status'] = health_status
         return health_status
 
+    @staticmethod
+    def _record_to_dict(user_record) -> Dict[str, Any]:
+        """Convert a Firebase Auth UserRecord to a plain dictionary."""
+        return {
+            'uid': user_record.uid,
+            'email': user_record.email,
+            'display_name': user_record.display_name,
+            'phone_number': user_record.phone_number,
+            'photo_url': user_record.photo_url,
+            'disabled': user_record.disabled,
+            'email_verified': user_record.email_verified,
+            'provider_data': [
+                {
+                    'uid': p.uid,
+                    'email': p.email,
+                    'display_name': p.display_name,
+                    'phone_number': p.phone_number,
+                    'photo_url': p.photo_url,
+                    'provider_id': p.provider_id
+                } for p in user_record.provider_data
+            ],
+            'metadata': {
+                'creation_timestamp': user_record.user_metadata.creation_timestamp,
+                'last_sign_in_timestamp': user_record.user_metadata.last_sign_in_timestamp,
+                'last_refresh_timestamp': user_record.user_metadata.last_refresh_timestamp,
+            }
+        }
+
+    async def _lookup_auth_user(self, key: Tuple[str, str], fetch: Callable) -> Optional[Dict[str, Any]]:
+        """
+        Look up an Auth user through the shared caches, one RPC per key at a time.
+        
+        Args:
+            key: ('uid', uid) or ('email', email)
+            fetch: Firebase Auth lookup taking the key value
+            
+        Returns:
+            User record dictionary, or None for a recently confirmed miss
+            
+        Raises:
+            UserNotFoundError: If the user does not exist (also cached briefly)
+        """
+        cached_user = _auth_user_cache.get(key)
+        if cached_user is not None:
+            return cached_user
+        if key in _auth_user_missing:
+            return None
+        
+        return await _single_flight(_auth_inflight, key, lambda: self._fetch_auth_user(key, fetch))
+
+    async def _fetch_auth_user(self, key: Tuple[str, str], fetch: Callable) -> Dict[str, Any]:
+        """Fetch an Auth user and cache it under both its uid and email."""
+        try:
+            user_record = await _run_in_pool(fetch, key[1])
+        except exceptions.UserNotFoundError:
+            _auth_user_missing[key] = True
+            raise
+        user = self._record_to_dict(user_record)
+        _auth_user_cache[('uid', user['uid'])] = user
+        if user['email']:
+            _auth_user_cache[('email', user['email'])] = user
+        return user
+
+    @staticmethod
+    def _invalidate_auth_user(uid: str, email: Optional[str] = None) -> None:
+        """Drop cached Auth lookups for a user after it changes."""
+        cached_user = _auth_user_cache.pop(('uid', uid), None)
+        _auth_user_missing.pop(('uid', uid), None)
+        for cached_email in {email, cached_user and cached_user['email']} - {None}:
+            _auth_user_cache.pop(('email', cached_email), None)
+            _auth_user_missing.pop(('email', cached_email), None)
+
     async def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """
         Get user record by email from Firebase Auth.
@@ -176,43 +807,19 @@ class FirebaseService:
             User record dictionary or None if not found
         """
         try:
-            user_record = self.auth.get_user_by_email(email)
-            return {
-                'uid': user_record.uid,
-                'email': user_record.email,
-                'display_name': user_record.display_name,
-                'phone_number': user_record.phone_number,
-                'photo_url': user_record.photo_url,
-                'disabled': user_record.disabled,
-                'email_verified': user_record.email_verified,
-                'provider_data': [
-                    {
-                        'uid': p.uid,
-                        'email': p.email,
-                        'display_name': p.display_name,
-                        'phone_number': p.phone_number,
-                        'photo_url': p.photo_url,
-                        'provider_id': p.provider_id
-                    } for p in user_record.provider_data
-                ],
-                'metadata': {
-                    'creation_timestamp': user_record.user_metadata.creation_timestamp,
-                    'last_sign_in_timestamp': user_record.user_metadata.last_sign_in_timestamp,
-                    'last_refresh_timestamp': user_record.user_metadata.last_refresh_timestamp,
-                }
-            }
+            return await self._lookup_auth_user(('email', email), self.auth.get_user_by_email)
             
         except exceptions.UserNotFoundError:
-            logger.info(f"User with email {email} not found in Firebase Auth")
+            logger.info("User with email %s not found in Firebase Auth", email)
             return None
         except exceptions.InvalidArgumentError as e:
-            logger.error(f"Invalid email format: {e}")
+            logger.error("Invalid email format: %s", e)
             return None
         except exceptions.FirebaseError as e:
             self._handle_firebase_error(e, f"Getting user by email {email}")
             return None
         except Exception as e:
-            logger.error(f"Unexpected error getting user by email {email}: {e}")
+            logger.error("Unexpected error getting user by email %s: %s", email, e)
             return None
 
     async def create_user(self, user_data: Dict[str, Any]) -> Optional[str]:
@@ -226,21 +833,22 @@ class FirebaseService:
             User ID if successful, None otherwise
         """
         try:
-            user_record = self.auth.create_user(**user_data)
-            logger.info(f"Created user {user_record.uid} with email {user_data.get('email')}")
+            user_record = await _run_in_pool(self.auth.create_user, **user_data)
+            self._invalidate_auth_user(user_record.uid, user_data.get('email'))
+            logger.info("Created user %s with email %s", user_record.uid, user_data.get('email'))
             return user_record.uid
             
         except exceptions.EmailAlreadyExistsError:
-            logger.error(f"User with email {user_data.get('email')} already exists")
+            logger.error("User with email %s already exists", user_data.get('email'))
             return None
         except exceptions.InvalidArgumentError as e:
-            logger.error(f"Invalid user data: {e}")
+            logger.error("Invalid user data: %s", e)
             return None
         except exceptions.FirebaseError as e:
             self._handle_firebase_error(e, "Creating user")
             return None
         except Exception as e:
-            logger.error(f"Unexpected error creating user: {e}")
+            logger.error("Unexpected error creating user: %s", e)
             return None
 
     async def update_user(self, uid: str, user_data: Dict[str, Any]) -> bool:
@@ -255,21 +863,22 @@ class FirebaseService:
             True if successful, False otherwise
         """
         try:
-            self.auth.update_user(uid, **user_data)
-            logger.info(f"Updated user {uid}")
+            await _run_in_pool(self.auth.update_user, uid, **user_data)
+            self._invalidate_auth_user(uid, user_data.get('email'))
+            logger.info("Updated user %s", uid)
             return True
             
         except exceptions.UserNotFoundError:
-            logger.error(f"User {uid} not found for update")
+            logger.error("User %s not found for update", uid)
             return False
         except exceptions.InvalidArgumentError as e:
-            logger.error(f"Invalid user data for update: {e}")
+            logger.error("Invalid user data for update: %s", e)
             return False
         except exceptions.FirebaseError as e:
             self._handle_firebase_error(e, f"Updating user {uid}")
             return False
         except Exception as e:
-            logger.error(f"Unexpected error updating user {uid}: {e}")
+            logger.error("Unexpected error updating user %s: %s", uid, e)
             return False
 
     async def delete_user(self, uid: str) -> bool:
@@ -283,45 +892,68 @@ class FirebaseService:
             True if successful, False otherwise
         """
         try:
-            self.auth.delete_user(uid)
-            logger.info(f"Deleted user {uid} from Firebase Auth")
+            await _run_in_pool(self.auth.delete_user, uid)
+            self._invalidate_auth_user(uid)
+            logger.info("Deleted user %s from Firebase Auth", uid)
             return True
             
         except exceptions.UserNotFoundError:
-            logger.error(f"User {uid} not found for deletion")
+            logger.error("User %s not found for deletion", uid)
             return False
         except exceptions.FirebaseError as e:
             self._handle_firebase_error(e, f"Deleting user {uid}")
             return False
         except Exception as e:
-            logger.error(f"Unexpected error deleting user {uid}: {e}")
+            logger.error("Unexpected error deleting user %s: %s", uid, e)
             return False
 
-    async def verify_id_token(self, id_token: str) -> Dict[str, Any]:
+    async def verify_id_token(self, id_token: str, check_revoked: bool = False) -> Dict[str, Any]:
         """
         Verify Firebase ID token and return user claims.
         
+        Tokens are verified locally against Google's cached signing keys; only
+        revocation checks go through the Firebase Admin SDK.
+        
         Args:
             id_token: Firebase ID token from client
+            check_revoked: Also check that the token has not been revoked (network call)
             
         Returns:
             Dictionary with user claims (uid, email, etc.)
         """
         try:
-            # Run the synchronous Firebase verification in an executor to avoid blocking
-            import asyncio
-            loop = asyncio.get_event_loop()
-            decoded_token = await loop.run_in_executor(None, self.auth.verify_id_token, id_token)
+            if check_revoked:
+                return await _run_in_pool(self.auth.verify_id_token, id_token, check_revoked=True)
+            
+            # Serve recently verified tokens from cache, never past their expiry
+            token_key = hashlib.sha256(id_token.encode()).digest()
+            cached_token = _token_cache.get(token_key)
+            if cached_token is not None and cached_token.get('exp', 0) > time.time():
+                return cached_token
+            
+            # Pick the signing key by kid; refetch once if Google rotated its keys
+            kid = jwt.get_unverified_header(id_token).get('kid')
+            certs = await refresh_firebase_certs()
+            if kid not in certs:
+                certs = await refresh_firebase_certs(force=True)
+            if kid not in certs:
+                raise jwt.InvalidTokenError(f"Unknown signing key id: {kid}")
+            
+            decoded_token = _decode_firebase_token(id_token, certs[kid])
+            _token_cache[token_key] = decoded_token
             return decoded_token
             
+        except jwt.PyJWTError as e:
+            logger.error("Invalid ID token: %s", e)
+            raise ValueError("Invalid or expired ID token")
         except exceptions.InvalidArgumentError as e:
-            logger.error(f"Invalid ID token format: {e}")
+            logger.error("Invalid ID token format: %s", e)
             raise ValueError("Invalid ID token format")
         except exceptions.FirebaseError as e:
-            logger.error(f"Firebase error verifying ID token: {e}")
+            logger.error("Firebase error verifying ID token: %s", e)
             raise ValueError("Invalid or expired ID token")
         except Exception as e:
-            logger.error(f"Unexpected error verifying ID token: {e}")
+            logger.error("Unexpected error verifying ID token: %s", e)
             raise ValueError("Token verification failed")
 
     async def create_custom_token(self, uid: str, additional_claims: Optional[Dict] = None) -> str:
@@ -336,17 +968,17 @@ class FirebaseService:
             Custom token string
         """
         try:
-            custom_token = self.auth.create_custom_token(uid, additional_claims)
+            custom_token = await _run_in_pool(self.auth.create_custom_token, uid, additional_claims)
             return custom_token.decode('utf-8')
             
         except exceptions.InvalidArgumentError as e:
-            logger.error(f"Invalid arguments for custom token: {e}")
+            logger.error("Invalid arguments for custom token: %s", e)
             raise ValueError("Invalid user ID or claims")
         except exceptions.FirebaseError as e:
-            logger.error(f"Firebase error creating custom token: {e}")
+            logger.error("Firebase error creating custom token: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error creating custom token: {e}")
+            logger.error("Unexpected error creating custom token: %s", e)
             raise
 
     async def get_user(self, uid: str) -> Optional[Dict[str, Any]]:
@@ -360,43 +992,19 @@ class FirebaseService:
             User record dictionary or None if not found
         """
         try:
-            user_record = self.auth.get_user(uid)
-            return {
-                'uid': user_record.uid,
-                'email': user_record.email,
-                'display_name': user_record.display_name,
-                'phone_number': user_record.phone_number,
-                'photo_url': user_record.photo_url,
-                'disabled': user_record.disabled,
-                'email_verified': user_record.email_verified,
-                'provider_data': [
-                    {
-                        'uid': p.uid,
-                        'email': p.email,
-                        'display_name': p.display_name,
-                        'phone_number': p.phone_number,
-                        'photo_url': p.photo_url,
-                        'provider_id': p.provider_id
-                    } for p in user_record.provider_data
-                ],
-                'metadata': {
-                    'creation_timestamp': user_record.user_metadata.creation_timestamp,
-                    'last_sign_in_timestamp': user_record.user_metadata.last_sign_in_timestamp,
-                    'last_refresh_timestamp': user_record.user_metadata.last_refresh_timestamp,
-                }
-            }
+            return await self._lookup_auth_user(('uid', uid), self.auth.get_user)
             
         except exceptions.UserNotFoundError:
-            logger.info(f"User {uid} not found in Firebase Auth")
+            logger.info("User %s not found in Firebase Auth", uid)
             return None
         except exceptions.InvalidArgumentError as e:
-            logger.error(f"Invalid user ID format: {e}")
+            logger.error("Invalid user ID format: %s", e)
             return None
         except exceptions.FirebaseError as e:
-            logger.error(f"Firebase error getting user {uid}: {e}")
+            logger.error("Firebase error getting user %s: %s", uid, e)
             return None
         except Exception as e:
-            logger.error(f"Unexpected error getting user {uid}: {e}")
+            logger.error("Unexpected error getting user %s: %s", uid, e)
             return None
 
     async def create_user_document(self, user_profile: UserProfile) -> bool:
@@ -410,16 +1018,17 @@ class FirebaseService:
             True if successful, False otherwise
         """
         try:
-            doc_ref = self.db.collection('users').document(user_profile.uid)
-            doc_ref.set(user_profile.dict())
-            logger.info(f"Created user document for {user_profile.uid}")
+            doc_ref = _user_async_refs(user_profile.uid)['doc']
+            await doc_ref.set(_fs_encode(user_profile.model_dump()))
+            _user_cache.pop(user_profile.uid, None)
+            logger.info("Created user document for %s", user_profile.uid)
             return True
             
         except exceptions.FirebaseError as e:
-            logger.error(f"Firebase error creating user document: {e}")
+            logger.error("Firebase error creating user document: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error creating user document: {e}")
+            logger.error("Unexpected error creating user document: %s", e)
             return False
 
     async def get_user_document(self, uid: str) -> Optional[UserProfile]:
@@ -433,46 +1042,174 @@ class FirebaseService:
             UserProfile object or None if not found
         """
         try:
-            doc_ref = self.db.collection('users').document(uid)
-            doc = doc_ref.get()
-            if doc.exists:
-                data = doc.to_dict()
-                return UserProfile(**data)
-            logger.info(f"User document not found for {uid}")
-            return None
+            cached_profile = _user_cache.get(uid)
+            if cached_profile is not None:
+                return cached_profile
+            
+            # Single flight: join an in-flight read for this uid instead of issuing another
+            return await _single_flight(_user_inflight, uid, lambda: self._load_user_document(uid))
             
         except exceptions.FirebaseError as e:
-            logger.error(f"Firebase error getting user document: {e}")
+            logger.error("Firebase error getting user document: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Unexpected error getting user document: {e}")
+            logger.error("Unexpected error getting user document: %s", e)
             return None
 
+    async def _load_user_document(self, uid: str) -> Optional[UserProfile]:
+        """Read a user document from Firestore and cache the parsed profile."""
+        doc_ref = _user_async_refs(uid)['doc']
+        doc = await doc_ref.get()
+        if doc.exists:
+            user_profile = UserProfile.model_validate(doc.to_dict())
+            _user_cache[uid] = user_profile
+            return user_profile
+        logger.info("User document not found for %s", uid)
+        return None
+
+    async def get_user_document_with_version(
+        self,
+        uid: str
+    ) -> Tuple[Optional[UserProfile], Optional[datetime]]:
+        """
+        Get user document from Firestore together with its update time.
+        
+        Always reads from Firestore (bypassing the profile cache) so the
+        returned update time can be passed to update_user_document_if_unchanged.
+        
+        Args:
+            uid: User ID
+            
+        Returns:
+            Tuple of (UserProfile or None if not found, document update time or None)
+        """
+        try:
+            doc = await _user_async_refs(uid)['doc'].get()
+            if not doc.exists:
+                logger.info("User document not found for %s", uid)
+                return None, None
+            user_profile = UserProfile.model_validate(doc.to_dict())
+            _user_cache[uid] = user_profile
+            return user_profile, doc.update_time
+            
+        except exceptions.FirebaseError as e:
+            logger.error("Firebase error getting user document: %s", e)
+            return None, None
+        except Exception as e:
+            logger.error("Unexpected error getting user document: %s", e)
+            return None, None
+
     async def update_user_document(self, uid: str, updates: Dict[str, Any]) -> bool:
         """
         Update user document in Firestore.
         
+        Fields are written with a single update() and no prior read. Nested
+        maps passed as values replace the stored map, and dotted keys address
+        nested fields.
+        
         Args:
             uid: User ID
             updates: Fields to update
             
         Returns:
-            True if successful, False otherwise
+            True if successful, False if the user document does not exist or the write failed
+        """
+        try:
+            await _user_async_refs(uid)['doc'].update(_fs_encode(updates))
+            _user_cache.pop(uid, None)
+            logger.debug("Updated user document for %s", uid)
+            return True
+            
+        except NotFound:
+            logger.error("User document %s not found for update", uid)
+            return False
+        except exceptions.FirebaseError as e:
+            logger.error("Firebase error updating user document: %s", e)
+            return False
+        except Exception as e:
+            logger.error("Unexpected error updating user document: %s", e)
+            return False
+
+    async def increment_user_field(
+        self,
+        uid: str,
+        field: str,
+        delta: int = 1,
+        updates: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Atomically add delta to a numeric field of a user document.
+        
+        The increment is applied server-side, so no read is needed and
+        concurrent increments are not lost.
+        
+        Args:
+            uid: User ID
+            field: Field path of the counter
+            delta: Amount to add (may be negative)
+            updates: Other fields to write in the same update
+            
+        Returns:
+            True if successful, False if the user document does not exist or the write failed
+        """
+        return await self._apply_user_field_transform(
+            uid, {**_fs_encode(updates or {}), field: firestore.Increment(delta)}
+        )
+
+    async def _apply_user_field_transform(self, uid: str, updates: Dict[str, Any]) -> bool:
+        """Apply an update containing transform sentinels to an existing user document."""
+        try:
+            await _user_async_refs(uid)['doc'].update(updates)
+            _user_cache.pop(uid, None)
+            logger.debug("Updated user document for %s", uid)
+            return True
+            
+        except NotFound:
+            logger.error("User document %s not found for update", uid)
+            return False
+        except exceptions.FirebaseError as e:
+            logger.error("Firebase error updating user document: %s", e)
+            return False
+        except Exception as e:
+            logger.error("Unexpected error updating user document: %s", e)
+            return False
+
+    async def update_user_document_if_unchanged(
+        self,
+        uid: str,
+        updates: Dict[str, Any],
+        update_time: datetime
+    ) -> bool:
+        """
+        Update user document only if it has not changed since it was read.
+        
+        The check is a last-update-time precondition evaluated by Firestore,
+        so compare-and-swap needs no read on the write path.
+        
+        Args:
+            uid: User ID
+            updates: Fields to update
+            update_time: Update time returned by get_user_document_with_version
+            
+        Returns:
+            True if written, False if the document changed or the write failed
         """
         try:
-            doc_ref = self.db.collection('users').document(uid)
-            doc_ref.update(updates)
-            logger.info(f"Updated user document for {uid}")
+            doc_ref = _user_async_refs(uid)['doc']
+            option = self.async_db.write_option(last_update_time=update_time)
+            await doc_ref.update(_fs_encode(updates), option=option)
+            _user_cache.pop(uid, None)
+            logger.debug("Updated user document for %s", uid)
             return True
             
-        except exceptions.NotFoundError:
-            logger.error(f"User document not found for update: {uid}")
+        except FailedPrecondition:
+            logger.info("User document %s changed since it was read, update skipped", uid)
             return False
         except exceptions.FirebaseError as e:
-            logger.error(f"Firebase error updating user document: {e}")
+            logger.error("Firebase error updating user document: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error updating user document: {e}")
+            logger.error("Unexpected error updating user document: %s", e)
             return False
 
     async def save_chat_session(self, uid: str, session_data: Dict[str, Any]) -> bool:
@@ -487,16 +1224,16 @@ class FirebaseService:
             True if successful, False otherwise
         """
         try:
-            doc_ref = self.db.collection('users').document(uid).collection('chat_sessions').document(session_data['session_id'])
-            doc_ref.set(session_data)
-            logger.info(f"Saved chat session {session_data['session_id']} for {uid}")
+            doc_ref = _user_refs(uid)['chat_sessions'].document(session_data['session_id'])
+            await self._set_document(doc_ref, session_data)
+            logger.debug("Saved chat session %s for %s", session_data['session_id'], uid)
             return True
             
         except exceptions.FirebaseError as e:
-            logger.error(f"Firebase error saving chat session: {e}")
+            logger.error("Firebase error saving chat session: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error saving chat session: {e}")
+            logger.error("Unexpected error saving chat session: %s", e)
             return False
 
     async def get_chat_session(self, uid: str, session_id: str) -> Optional[Dict[str, Any]]:
@@ -511,24 +1248,27 @@ class FirebaseService:
             Session data or None if not found
         """
         try:
-            doc_ref = self.db.collection('users').document(uid).collection('chat_sessions').document(session_id)
-            doc = doc_ref.get()
+            doc_ref = _user_async_refs(uid)['chat_sessions'].document(session_id)
+            doc = await doc_ref.get()
             if doc.exists:
                 return doc.to_dict()
-            logger.info(f"Chat session {session_id} not found for {uid}")
+            logger.info("Chat session %s not found for %s", session_id, uid)
             return None
             
         except exceptions.FirebaseError as e:
-            logger.error(f"Firebase error getting chat session: {e}")
+            logger.error("Firebase error getting chat session: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Unexpected error getting chat session: {e}")
+            logger.error("Unexpected error getting chat session: %s", e)
             return None
 
     async def save_mood_entry(self, uid: str, mood_data: Dict[str, Any]) -> bool:
         """
         Save mood entry to Firestore.
         
+        The write is committed together with other saves issued in the same
+        short window; it is visible to get_mood_entries once this returns.
+        
         Args:
             uid: User ID
             mood_data: Mood entry data
@@ -537,48 +1277,80 @@ class FirebaseService:
             True if successful, False otherwise
         """
         try:
-            doc_ref = self.db.collection('users').document(uid).collection('mood_entries').document(mood_data['id'])
-            doc_ref.set(mood_data)
-            logger.info(f"Saved mood entry {mood_data['id']} for {uid}")
+            doc_ref = _user_refs(uid)['mood_entries'].document(mood_data['id'])
+            await self._set_document(doc_ref, mood_data, coalesce=True)
+            logger.debug("Saved mood entry %s for %s", mood_data['id'], uid)
             return True
             
         except exceptions.FirebaseError as e:
-            logger.error(f"Firebase error saving mood entry: {e}")
+            logger.error("Firebase error saving mood entry: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error saving mood entry: {e}")
+            logger.error("Unexpected error saving mood entry: %s", e)
             return False
 
-    async def get_mood_entries(self, uid: str, limit: int = 30) -> List[Dict[str, Any]]:
+    async def get_mood_entries(
+        self,
+        uid: str,
+        limit: int = 30,
+        fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Get recent mood entries for a user.
         
         Args:
             uid: User ID
             limit: Maximum number of entries to return
+            fields: Only read these fields ('id' and 'date' are always included)
             
         Returns:
             List of mood entries
         """
+        entries, _ = await self.get_mood_entries_page(uid, limit, fields=fields)
+        return entries
+
+    async def get_mood_entries_page(
+        self,
+        uid: str,
+        limit: int = 30,
+        start_after: Optional[Any] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Any]]:
+        """
+        Get one page of mood entries for a user, newest first.
+        
+        Args:
+            uid: User ID
+            limit: Maximum number of entries to return
+            start_after: Snapshot returned by the previous page, or None for the first page
+            fields: Only read these fields ('id' and 'date' are always included)
+            
+        Returns:
+            Tuple of (mood entries, last document snapshot for the next page or None)
+        """
         try:
-            collection_ref = self.db.collection('users').document(uid).collection('mood_entries')
-            query = collection_ref.order_by('date', direction=firestore.Query.DESCENDING).limit(limit)
-            docs = query.stream()
-            entries = [doc.to_dict() for doc in docs]
-            logger.info(f"Retrieved {len(entries)} mood entries for {uid}")
-            return entries
+            projection = _projection(fields, 'date')
+            query = _newest_first_query(uid, 'mood_entries', 'date', limit, projection)
+            if start_after is not None:
+                query = query.start_after(start_after)
+            entries, last_snapshot = await self._read_query_page(query)
+            logger.debug("Retrieved %s mood entries for %s", len(entries), uid)
+            return entries, last_snapshot
             
         except exceptions.FirebaseError as e:
-            logger.error(f"Firebase error getting mood entries: {e}")
-            return []
+            logger.error("Firebase error getting mood entries: %s", e)
+            return [], None
         except Exception as e:
-            logger.error(f"Unexpected error getting mood entries: {e}")
-            return []
+            logger.error("Unexpected error getting mood entries: %s", e)
+            return [], None
 
     async def save_journal_entry(self, uid: str, journal_data: Dict[str, Any]) -> bool:
         """
         Save journal entry to Firestore.
         
+        The write is committed together with other saves issued in the same
+        short window; it is visible to get_journal_entries once this returns.
+        
         Args:
             uid: User ID
             journal_data: Journal entry data
@@ -587,43 +1359,72 @@ class FirebaseService:
             True if successful, False otherwise
         """
         try:
-            doc_ref = self.db.collection('users').document(uid).collection('journal_entries').document(journal_data['id'])
-            doc_ref.set(journal_data)
-            logger.info(f"Saved journal entry {journal_data['id']} for {uid}")
+            doc_ref = _user_refs(uid)['journal_entries'].document(journal_data['id'])
+            await self._set_document(doc_ref, journal_data, coalesce=True)
+            logger.debug("Saved journal entry %s for %s", journal_data['id'], uid)
             return True
             
         except exceptions.FirebaseError as e:
-            logger.error(f"Firebase error saving journal entry: {e}")
+            logger.error("Firebase error saving journal entry: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error saving journal entry: {e}")
+            logger.error("Unexpected error saving journal entry: %s", e)
             return False
 
-    async def get_journal_entries(self, uid: str, limit: int = 20) -> List[Dict[str, Any]]:
+    async def get_journal_entries(
+        self,
+        uid: str,
+        limit: int = 20,
+        fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Get recent journal entries for a user.
         
         Args:
             uid: User ID
             limit: Maximum number of entries to return
+            fields: Only read these fields ('id' and 'created_at' are always included)
             
         Returns:
             List of journal entries
         """
+        entries, _ = await self.get_journal_entries_page(uid, limit, fields=fields)
+        return entries
+
+    async def get_journal_entries_page(
+        self,
+        uid: str,
+        limit: int = 20,
+        start_after: Optional[Any] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Any]]:
+        """
+        Get one page of journal entries for a user, newest first.
+        
+        Args:
+            uid: User ID
+            limit: Maximum number of entries to return
+            start_after: Snapshot returned by the previous page, or None for the first page
+            fields: Only read these fields ('id' and 'created_at' are always included)
+            
+        Returns:
+            Tuple of (journal entries, last document snapshot for the next page or None)
+        """
         try:
-            collection_ref = self.db.collection('users').document(uid).collection('journal_entries')
-            query = collection_ref.order_by('created_at', direction=firestore.Query.DESCENDING).limit(limit)
-            docs = query.stream()
-            entries = [doc.to_dict() for doc in docs]
-            logger.info(f"Retrieved {len(entries)} journal entries for {uid}")
-            return entries
+            projection = _projection(fields, 'created_at')
+            query = _newest_first_query(uid, 'journal_entries', 'created_at', limit, projection)
+            if start_after is not None:
+                query = query.start_after(start_after)
+            entries, last_snapshot = await self._read_query_page(query)
+            logger.debug("Retrieved %s journal entries for %s", len(entries), uid)
+            return entries, last_snapshot
             
         except exceptions.FirebaseError as e:
-            logger.error(f"Firebase error getting journal entries: {e}")
-            return []
+            logger.error("Firebase error getting journal entries: %s", e)
+            return [], None
         except Exception as e:
-            logger.error(f"Unexpected error getting journal entries: {e}")
-            return []
+            logger.error("Unexpected error getting journal entries: %s", e)
+            return [], None
 
     async def save_meditation_session(self, uid: str, meditation_data: Dict[str, Any]) -> bool:
         """
@@ -637,19 +1438,23 @@ class FirebaseService:
             True if successful, False otherwise
         """
         try:
-            doc_ref = self.db.collection('users').document(uid).collection('meditation_sessions').document(meditation_data['id'])
-            doc_ref.set(meditation_data)
-            logger.info(f"Saved meditation session {meditation_data['id']} for {uid}")
+            doc_ref = _user_refs(uid)['meditation_sessions'].document(meditation_data['id'])
+            await self._set_document(doc_ref, meditation_data)
+            logger.debug("Saved meditation session %s for %s", meditation_data['id'], uid)
             return True
             
         except exceptions.FirebaseError as e:
-            logger.error(f"Firebase error saving meditation session: {e}")
+            logger.error("Firebase error saving meditation session: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error saving meditation session: {e}")
+            logger.error("Unexpected error saving meditation session: %s", e)
             return False
 
-    async def batch_write(self, operations: List[Dict[str, Any]]) -> bool:
+    async def batch_write(
+        self,
+        operations: List[Dict[str, Any]],
+        bulk: bool = False
+    ) -> bool:
         """
         Perform batch write operations.
         
@@ -660,43 +1465,169 @@ class FirebaseService:
             - collection: collection path
             - document: document ID
             - data: data to write (for set/update operations)
+            Up to FIRESTORE_BATCH_LIMIT operations commit atomically as one
+            batch. Larger writes are split into chunks sized by the shared
+            adaptive chunk size and committed in order, keeping all operations
+            on a document in the same chunk. An aborted chunk is retried with
+            backoff and the remaining operations are re-chunked at the reduced size.
+            bulk: Send the operations through a BulkWriter, which pipelines
+                individual writes with its own flow control and per-write retries
+                instead of committing batches. Used automatically above
+                BULK_WRITE_THRESHOLD operations. Writes are not grouped atomically.
             
         Returns:
             True if successful, False otherwise
         """
+        if not operations:
+            return True
         try:
-            batch = self.db.batch()
-            
+            writes = []
+            # Resolve each distinct collection path once rather than per operation
+            collection_refs: Dict[str, Any] = {}
             for op in operations:
                 if 'collection' in op and 'document' in op:
-                    doc_ref = self.db.collection(op['collection']).document(op['document'])
+                    collection_ref = collection_refs.get(op['collection'])
+                    if collection_ref is None:
+                        collection_ref = collection_refs[op['collection']] = self.db.collection(op['collection'])
+                    doc_ref = collection_ref.document(op['document'])
                 elif 'ref' in op:
                     # Support legacy format with direct reference
                     doc_ref = op['ref']
                 else:
-                    logger.error(f"Invalid operation format: {op}")
+                    logger.error("Invalid operation format: %s", op)
                     continue
                 
-                if op['type'] == 'set':
-                    batch.set(doc_ref, op['data'])
-                elif op['type'] == 'update':
-                    batch.update(doc_ref, op['data'])
-                elif op['type'] == 'delete':
-                    batch.delete(doc_ref)
-                else:
-                    logger.error(f"Unknown operation type: {op['type']}")
+                if op['type'] not in ('set', 'update', 'delete'):
+                    logger.error("Unknown operation type: %s", op['type'])
+                    continue
+                writes.append((op['type'], doc_ref, op.get('data')))
+            
+            if bulk or len(writes) > BULK_WRITE_THRESHOLD:
+                return await self._bulk_write(writes)
+            
+            groups = _group_writes_by_document(writes)
+            atomic = len(writes) <= FIRESTORE_BATCH_LIMIT
+            committed = 0
+            commits = 0
+            attempt = 0
+            start = 0
+            while start < len(groups):
+                # Chunks are cut from the uncommitted remainder only, so nothing is re-sent
+                size = FIRESTORE_BATCH_LIMIT if atomic else _batch_size.size
+                chunk = []
+                end = start
+                while end < len(groups) and (not chunk or len(chunk) + len(groups[end]) <= size):
+                    chunk.extend(groups[end])
+                    end += 1
+                
+                try:
+                    await _run_in_pool(self._build_batch(chunk).commit)
+                except Aborted:
+                    _batch_size.record_aborted()
+                    if attempt == BATCH_WRITE_MAX_RETRIES:
+                        logger.error(
+                            "Batch write aborted after %s attempts, %s of %s operations committed",
+                            attempt + 1, committed, len(writes)
+                        )
+                        return False
+                    await asyncio.sleep(0.05 * (2 ** attempt))
+                    attempt += 1
                     continue
+                except Exception:
+                    if committed:
+                        logger.error("Batch write failed after committing %s of %s operations", committed, len(writes))
+                    raise
+                
+                _batch_size.record_success()
+                committed += len(chunk)
+                commits += 1
+                attempt = 0
+                start = end
             
-            batch.commit()
-            logger.info(f"Successfully completed batch write with {len(operations)} operations")
+            logger.info("Successfully completed batch write with %s operations in %s batches", len(operations), commits)
             return True
             
         except exceptions.FirebaseError as e:
-            logger.error(f"Firebase error performing batch write: {e}")
+            logger.error("Firebase error performing batch write: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error performing batch write: {e}")
+            logger.error("Unexpected error performing batch write: %s", e)
+            return False
+
+    async def _bulk_write(self, writes: List[tuple]) -> bool:
+        """Apply (type, doc_ref, data) writes through a dedicated BulkWriter."""
+        bulk_writer = self.db.bulk_writer()
+        failures = []
+        
+        def on_write_error(failure, _writer) -> bool:
+            if failure.attempts < BULK_DELETE_MAX_ATTEMPTS:
+                return True
+            failures.append(failure)
+            return False
+        
+        bulk_writer.on_write_error(on_write_error)
+        for op_type, doc_ref, data in writes:
+            if op_type == 'set':
+                bulk_writer.set(doc_ref, data)
+            elif op_type == 'update':
+                bulk_writer.update(doc_ref, data)
+            else:
+                bulk_writer.delete(doc_ref)
+        await _run_in_pool(bulk_writer.close)
+        
+        if failures:
+            logger.error("Bulk write failed for %s of %s operations", len(failures), len(writes))
             return False
+        logger.info("Successfully completed bulk write with %s operations", len(writes))
+        return True
+
+    def _build_batch(self, writes: List[tuple]):
+        """Build a WriteBatch from (type, doc_ref, data) tuples."""
+        batch = self.db.batch()
+        for op_type, doc_ref, data in writes:
+            if op_type == 'set':
+                batch.set(doc_ref, data)
+            elif op_type == 'update':
+                batch.update(doc_ref, data)
+            else:
+                batch.delete(doc_ref)
+        return batch
+
+    async def batch_read(self, refs: List[Any]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Read several documents in a single BatchGetDocuments RPC.
+        
+        Args:
+            refs: Document references, or dicts with 'collection' and 'document'
+                keys as accepted by batch_write
+            
+        Returns:
+            Document data in the same order as refs, None for missing documents
+        """
+        try:
+            doc_refs = [
+                self.async_db.collection(ref['collection']).document(ref['document'])
+                if isinstance(ref, dict) else self.async_db.document(ref.path)
+                for ref in refs
+            ]
+            if not doc_refs:
+                return []
+            
+            snapshots = [snapshot async for snapshot in self.async_db.get_all(doc_refs)]
+            # get_all does not preserve request order
+            by_path = {
+                snapshot.reference.path: snapshot.to_dict() if snapshot.exists else None
+                for snapshot in snapshots
+            }
+            logger.debug("Batch read %s documents", len(doc_refs))
+            return [by_path.get(doc_ref.path) for doc_ref in doc_refs]
+            
+        except exceptions.FirebaseError as e:
+            logger.error("Firebase error performing batch read: %s", e)
+            return [None] * len(refs)
+        except Exception as e:
+            logger.error("Unexpected error performing batch read: %s", e)
+            return [None] * len(refs)
 
     async def get_user_collections_data(self, uid: str) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -709,22 +1640,25 @@ class FirebaseService:
             Dictionary with collection names as keys and document lists as values
         """
         try:
-            user_data = {}
-            collections = ['chat_sessions', 'mood_entries', 'journal_entries', 'meditation_sessions']
+            refs = _user_async_refs(uid)
             
-            for collection_name in collections:
-                collection_ref = self.db.collection('users').document(uid).collection(collection_name)
-                docs = collection_ref.stream()
-                user_data[collection_name] = [doc.to_dict() for doc in docs]
-                
-            logger.info(f"Retrieved all collection data for {uid}")
+            async def read_collection(collection_ref) -> List[Dict[str, Any]]:
+                return [doc.to_dict() async for doc in collection_ref.stream()]
+            
+            # Stream all subcollections concurrently; latency is the slowest read, not the sum
+            results = await asyncio.gather(*[
+                read_collection(refs[collection_name]) for collection_name in USER_COLLECTIONS
+            ])
+            user_data = dict(zip(USER_COLLECTIONS, results))
+            
+            logger.info("Retrieved all collection data for %s", uid)
             return user_data
             
         except exceptions.FirebaseError as e:
-            logger.error(f"Firebase error getting user collections: {e}")
+            logger.error("Firebase error getting user collections: %s", e)
             return {}
         except Exception as e:
-            logger.error(f"Unexpected error getting user collections: {e}")
+            logger.error("Unexpected error getting user collections: %s", e)
             return {}
 
     async def delete_user_data(self, uid: str) -> bool:
@@ -738,59 +1672,72 @@ class FirebaseService:
             True if successful, False otherwise
         """
         try:
-            # Delete all subcollections first
-            collections = ['chat_sessions', 'mood_entries', 'journal_entries', 'meditation_sessions']
+            # BulkWriter pipelines the deletes with throttling and per-write retries
+            bulk_writer = self.db.bulk_writer()
+            failures = []
             
-            for collection_name in collections:
-                collection_ref = self.db.collection('users').document(uid).collection(collection_name)
-                docs = collection_ref.list_documents()
-                
-                # Delete in batches to avoid timeout
-                batch = self.db.batch()
+            def on_write_error(failure, _writer) -> bool:
+                if failure.attempts < BULK_DELETE_MAX_ATTEMPTS:
+                    return True
+                failures.append(failure)
+                return False
+            
+            bulk_writer.on_write_error(on_write_error)
+            async_refs = _user_async_refs(uid)
+            
+            async def enqueue_deletes(collection_name: str) -> int:
                 count = 0
-                
-                for doc in docs:
-                    batch.delete(doc)
+                async for doc_ref in async_refs[collection_name].list_documents(page_size=1000):
+                    bulk_writer.delete(self.db.document(doc_ref.path))
                     count += 1
-                    
-                    if count >= 500:  # Firestore batch limit
-                        batch.commit()
-                        batch = self.db.batch()
-                        count = 0
-                
-                if count > 0:
-                    batch.commit()
+                return count
+            
+            # List all subcollections concurrently, feeding deletes as pages arrive
+            counts = await asyncio.gather(*[enqueue_deletes(name) for name in USER_COLLECTIONS])
             
             # Delete main user document
-            self.db.collection('users').document(uid).delete()
+            bulk_writer.delete(_user_refs(uid)['doc'])
+            await _run_in_pool(bulk_writer.close)
+            _user_cache.pop(uid, None)
             
-            logger.info(f"Successfully deleted all data for user {uid}")
+            if failures:
+                logger.error("Failed to delete %s documents for user %s", len(failures), uid)
+                return False
+            logger.info("Deleted %s subcollection documents for user %s", sum(counts), uid)
+            
+            logger.info("Successfully deleted all data for user %s", uid)
             return True
             
         except exceptions.FirebaseError as e:
-            logger.error(f"Firebase error deleting user data: {e}")
+            logger.error("Firebase error deleting user data: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error deleting user data: {e}")
+            logger.error("Unexpected error deleting user data: %s", e)
             return False
 
     # Firebase Storage methods
 
     async def upload_file_to_storage(
         self, 
-        file_data: bytes, 
+        file_data: Union[bytes, BinaryIO], 
         file_path: str, 
         content_type: str = "image/jpeg",
-        metadata: Optional[Dict[str, str]] = None
+        metadata: Optional[Dict[str, str]] = None,
+        cache_control: Optional[str] = None
     ) -> Optional[str]:
         """
         Upload a file to Firebase Storage.
         
+        Files larger than STORAGE_UPLOAD_CHUNK_SIZE, and streams of unknown
+        size, are sent as resumable uploads in chunks instead of one request body.
+        
         Args:
-            file_data: File data as bytes
+            file_data: File data as bytes or a binary file object
             file_path: Path in storage (e.g., "mitra_profiles/mitra.jpg")
             content_type: MIME type of the file
             metadata: Optional metadata dictionary
+            cache_control: Cache-Control header for browser and CDN caching;
+                defaults by path prefix (see STORAGE_CACHE_CONTROL)
             
         Returns:
             Public URL of uploaded file or None if failed
@@ -803,24 +1750,61 @@ class FirebaseService:
             if metadata:
                 blob.metadata = metadata
             
-            # Upload file
-            blob.upload_from_string(
-                file_data,
-                content_type=content_type
-            )
+            cache_control = cache_control or _default_cache_control(file_path)
+            if cache_control:
+                blob.cache_control = cache_control
             
-            # Make blob publicly readable
-            blob.make_public()
+            if isinstance(file_data, (bytes, bytearray)):
+                size = len(file_data)
+                stream = io.BytesIO(file_data)
+            else:
+                size = None
+                stream = file_data
+            if size is None or size > STORAGE_UPLOAD_CHUNK_SIZE:
+                blob.chunk_size = STORAGE_UPLOAD_CHUNK_SIZE
+            
+            # Upload file; the public-read ACL is applied by the upload request
+            # itself, so no separate make_public() call is needed
+            await _run_in_storage_pool(
+                blob.upload_from_file,
+                stream,
+                content_type=content_type,
+                size=size,
+                predefined_acl="publicRead"
+            )
             
-            # Return public URL
-            public_url = blob.public_url
-            logger.info(f"Successfully uploaded file to {file_path}: {public_url}")
+            public_url = self._public_url(file_path)
+            _public_url_cache[file_path] = public_url
+            logger.info("Successfully uploaded file to %s: %s", file_path, public_url)
             return public_url
             
         except Exception as e:
-            logger.error(f"Error uploading file to storage {file_path}: {e}")
+            logger.error("Error uploading file to storage %s: %s", file_path, e)
             return None
 
+    async def upload_files(
+        self,
+        items: List[Tuple[bytes, str, str, Optional[Dict[str, str]]]],
+        concurrency: int = 8
+    ) -> List[Optional[str]]:
+        """
+        Upload several files to Firebase Storage concurrently.
+        
+        Args:
+            items: (file_data, file_path, content_type, metadata) tuples
+            concurrency: Maximum number of uploads in flight
+            
+        Returns:
+            Public URLs in the same order as items, None for failed uploads
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def upload_one(file_data, file_path, content_type, metadata):
+            async with semaphore:
+                return await self.upload_file_to_storage(file_data, file_path, content_type, metadata)
+        
+        return await asyncio.gather(*[upload_one(*item) for item in items])
+
     async def download_file_from_storage(self, file_path: str) -> Optional[bytes]:
         """
         Download a file from Firebase Storage.
@@ -832,18 +1816,15 @@ class FirebaseService:
             File data as bytes or None if not found
         """
         try:
-            blob = self.storage_bucket.blob(file_path)
-            
-            if not blob.exists():
-                logger.debug(f"File does not exist in storage: {file_path}")
-                return None
-            
-            file_data = blob.download_as_bytes()
-            logger.debug(f"Successfully downloaded file from {file_path}")
+            file_data = await _run_in_storage_pool(self.storage_bucket.blob(file_path).download_as_bytes)
+            logger.debug("Successfully downloaded file from %s", file_path)
             return file_data
             
+        except NotFound:
+            logger.debug("File does not exist in storage: %s", file_path)
+            return None
         except Exception as e:
-            logger.error(f"Error downloading file from storage {file_path}: {e}")
+            logger.error("Error downloading file from storage %s: %s", file_path, e)
             return None
 
     async def delete_file_from_storage(self, file_path: str) -> bool:
@@ -857,45 +1838,55 @@ class FirebaseService:
             True if deleted successfully, False otherwise
         """
         try:
-            blob = self.storage_bucket.blob(file_path)
-            
-            if not blob.exists():
-                logger.debug(f"File does not exist in storage: {file_path}")
-                return True  # Consider as successful deletion
-            
-            blob.delete()
-            logger.info(f"Successfully deleted file from storage: {file_path}")
+            _public_url_cache.pop(file_path, None)
+            await _run_in_storage_pool(self.storage_bucket.blob(file_path).delete)
+            logger.info("Successfully deleted file from storage: %s", file_path)
             return True
             
+        except NotFound:
+            logger.debug("File does not exist in storage: %s", file_path)
+            return True  # Consider as successful deletion
         except Exception as e:
-            logger.error(f"Error deleting file from storage {file_path}: {e}")
+            logger.error("Error deleting file from storage %s: %s", file_path, e)
             return False
 
-    async def get_file_public_url(self, file_path: str) -> Optional[str]:
+    async def get_file_public_url(self, file_path: str, verify: bool = False) -> Optional[str]:
         """
         Get the public URL of a file in Firebase Storage.
         
+        The URL is computed locally; no request is made unless verify is set
+        and the file was not recently uploaded or verified.
+        
         Args:
             file_path: Path in storage
+            verify: Check that the file exists first (one extra request)
             
         Returns:
-            Public URL or None if file doesn't exist
+            Public URL, or None if verify is set and the file doesn't exist
         """
         try:
-            blob = self.storage_bucket.blob(file_path)
+            if not verify:
+                return self._public_url(file_path)
+            
+            public_url = _public_url_cache.get(file_path)
+            if public_url is not None:
+                return public_url
             
-            if not blob.exists():
-                logger.debug(f"File does not exist in storage: {file_path}")
+            if not await _run_in_storage_pool(self.storage_bucket.blob(file_path).exists):
+                logger.debug("File does not exist in storage: %s", file_path)
                 return None
             
-            # Make sure it's public
-            blob.make_public()
-            return blob.public_url
+            public_url = _public_url_cache[file_path] = self._public_url(file_path)
+            return public_url
             
         except Exception as e:
-            logger.error(f"Error getting public URL for {file_path}: {e}")
+            logger.error("Error getting public URL for %s: %s", file_path, e)
             return None
 
+    def _public_url(self, file_path: str) -> str:
+        """Build the public download URL of an object in the storage bucket."""
+        return f"https://storage.googleapis.com/{self.storage_bucket.name}/{quote(file_path)}"
+
     async def list_files_in_directory(self, directory_path: str) -> List[str]:
         """
         List all files in a specific directory in Firebase Storage.
@@ -907,17 +1898,61 @@ class FirebaseService:
             List of file paths
         """
         try:
-            # Ensure directory path ends with /
-            if not directory_path.endswith("/"):
-                directory_path += "/"
-            
-            blobs = self.storage_bucket.list_blobs(prefix=directory_path)
-            file_paths = [blob.name for blob in blobs if not blob.name.endswith("/")]
-            
-            logger.debug(f"Found {len(file_paths)} files in {directory_path}")
+            file_paths = [file_path async for file_path in self.iter_files_in_directory(directory_path)]
+            logger.debug("Found %s files in %s", len(file_paths), directory_path)
             return file_paths
             
         except Exception as e:
-            logger.error(f"Error listing files in {directory_path}: {e}")
+            logger.error("Error listing files in %s: %s", directory_path, e)
             return []
 
+    async def iter_files_in_directory(self, directory_path: str, page_size: int = 1000) -> AsyncIterator[str]:
+        """
+        Iterate over the files in a directory in Firebase Storage, page by page.
+        
+        Each page is fetched on the storage pool when the previous one has been
+        consumed, so memory is bounded by page_size and the first paths are
+        available before the listing completes.
+        
+        Args:
+            directory_path: Directory path in storage (e.g., "mitra_profiles/")
+            page_size: Number of blobs requested per list call
+            
+        Yields:
+            File paths
+        """
+        # Ensure directory path ends with /
+        if not directory_path.endswith("/"):
+            directory_path += "/"
+        
+        # Only names are used, so request just those instead of full object metadata
+        pages = self.storage_bucket.list_blobs(
+            prefix=directory_path,
+            page_size=page_size,
+            fields='items(name),nextPageToken'
+        ).pages
+        while True:
+            # Advancing the page iterator issues the list request
+            page = await _run_in_storage_pool(next, pages, None)
+            if page is None:
+                return
+            for blob in page:
+                if not blob.name.endswith("/"):
+                    yield blob.name
+
+
+# Process-wide service instance shared by routers and repositories
+_firebase_service: Optional[FirebaseService] = None
+
+
+def get_firebase_service() -> FirebaseService:
+    """
+    Return the shared FirebaseService, initializing Firebase on first use.
+    
+    Returns:
+        FirebaseService instance
+    """
+    global _firebase_service
+    if _firebase_service is None:
+        _firebase_service = FirebaseService()
+    return _firebase_service
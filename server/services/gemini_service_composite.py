@@ -37,6 +37,12 @@ class GeminiService(BaseGeminiService):
             messages, user_profile, problem_category, config, include_grounding
         )
     
+    def stream_text_response(self, messages, user_profile=None, problem_category=None, config=None, include_grounding=False):
+        """Stream personalized text response pieces as they are generated."""
+        return self.text_service.stream_text_response(
+            messages, user_profile, problem_category, config, include_grounding
+        )
+    
     async def generate_structured_content(self, prompt, schema):
         """Generate structured content using response schema."""
         return await self.text_service.generate_structured_content(prompt, schema)
@@ -46,6 +52,10 @@ class GeminiService(BaseGeminiService):
         """Generate personalized voice response using Gemini Live API."""
         return await self.voice_service.generate_voice_response(messages, user_profile, problem_category, voice, language)
     
+    def stream_voice_response(self, messages, user_profile=None, problem_category=None, voice=None, language="en"):
+        """Stream personalized voice response frames as they are generated."""
+        return self.voice_service.stream_voice_response(messages, user_profile, problem_category, voice, language)
+    
     async def process_voice_input(self, audio_data, sample_rate=16000):
         """Process voice input and convert to text."""
         return await self.voice_service.process_voice_input(audio_data, sample_rate)
@@ -60,15 +70,15 @@ class GeminiService(BaseGeminiService):
         return await self.image_service.edit_image(image_data, edit_prompt)
     
     # Wellness methods - delegate to WellnessService
-    async def generate_meditation_script(self, meditation_type, duration_minutes, focus_area=None):
+    async def generate_meditation_script(self, meditation_type, duration_minutes, focus_area=None, user_profile=None):
         """Generate a custom meditation script."""
         return await self.wellness_service.generate_meditation_script(
-            meditation_type, duration_minutes, focus_area
+            meditation_type, duration_minutes, focus_area, user_profile
         )
     
-    async def generate_wellness_insight(self, user_data):
+    async def generate_wellness_insight(self, user_data, strict=True):
         """Generate personalized wellness insights based on user data."""
-        return await self.wellness_service.generate_wellness_insight(user_data)
+        return await self.wellness_service.generate_wellness_insight(user_data, strict)
     
     async def generate_coping_strategy(self, emotion, situation, user_preferences=None):
         """Generate personalized coping strategies."""
@@ -3,12 +3,11 @@ Image generation and editing service for Mitra AI.
 Handles image creation and modification using Gemini.
 """
 
-import asyncio
 import logging
-import io
-from PIL import Image
 
-from .base_gemini_service import BaseGeminiService
+from google.genai import types
+
+from .base_gemini_service import BaseGeminiService, sniff_image_mime
 from core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -42,8 +41,7 @@ class ImageService(BaseGeminiService):
             Avoid any disturbing or triggering content.
             """
             
-            response = await asyncio.to_thread(
-                self.client.models.generate_content,
+            response = await self.generate_content(
                 model=settings.gemini_image_model,
                 contents=[enhanced_prompt]
             )
@@ -75,9 +73,6 @@ class ImageService(BaseGeminiService):
             Edited image data
         """
         try:
-            # Convert image data to PIL Image for processing
-            image = Image.open(io.BytesIO(image_data))
-            
             # Create edit prompt
             prompt = f"""
             Edit this image based on the following instructions: {edit_prompt}
@@ -86,10 +81,13 @@ class ImageService(BaseGeminiService):
             Keep the style consistent and avoid any disturbing elements.
             """
             
-            response = await asyncio.to_thread(
-                self.client.models.generate_content,
+            response = await self.generate_content(
                 model=settings.gemini_image_model,
-                contents=[prompt, image]
+                contents=[
+                    prompt,
+                    # Send the original bytes instead of a decoded image the SDK would re-encode
+                    types.Part.from_bytes(data=image_data, mime_type=sniff_image_mime(image_data))
+                ]
             )
             
             # Extract edited image data
@@ -5,13 +5,11 @@ Handles real-time voice conversations with WebSocket connections for phone call-
 
 import asyncio
 import logging
-import json
 import uuid
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 import base64
 
-from google import genai
 from google.genai import types
 
 from .base_gemini_service import BaseGeminiService
@@ -22,6 +20,38 @@ from models.wellness import VoiceSession, VoiceSessionState, VoiceTranscriptEven
 logger = logging.getLogger(__name__)
 
 
+# Persona instruction for live voice sessions
+_LIVE_SYSTEM_INSTRUCTION = """You are Mitra, a compassionate AI wellness companion specializing in mental health support. 
+
+IMPORTANT GUIDELINES:
+- Respond with natural, conversational audio in a warm, empathetic tone
+- Keep responses concise and engaging (30-60 seconds of speech)
+- Use active listening techniques and validate emotions
+- Ask follow-up questions to encourage deeper sharing
+- Provide gentle guidance and coping strategies when appropriate
+- Be supportive but not prescriptive - you're not replacing professional therapy
+- Use the user's name occasionally to create connection
+- Respond as if this is a live phone conversation
+
+CONVERSATION STYLE:
+- Natural pauses and conversational flow
+- Empathetic acknowledgments ("I hear you", "That sounds difficult")
+- Gentle probing questions to understand better
+- Offer practical wellness techniques when relevant
+- Maintain professional boundaries while being warm and caring"""
+
+# Per-category focus appended to the live voice instruction
+_LIVE_CATEGORY_GUIDANCE: Dict[ProblemCategory, str] = {
+    ProblemCategory.STRESS_ANXIETY: "Focus on breathing techniques, grounding exercises, and anxiety management strategies.",
+    ProblemCategory.DEPRESSION_SADNESS: "Emphasize emotional validation, gentle encouragement, and mood improvement techniques.",
+    ProblemCategory.RELATIONSHIP_ISSUES: "Focus on communication skills, boundary setting, and relationship dynamics.",
+    ProblemCategory.SELF_ESTEEM: "Emphasize self-compassion, strength identification, and confidence building.",
+    ProblemCategory.GRIEF_LOSS: "Provide gentle support, validation of grief process, and coping strategies.",
+    ProblemCategory.SOCIAL_ANXIETY: "Focus on social confidence building, exposure techniques, and coping strategies.",
+    ProblemCategory.GENERAL_WELLNESS: "Be flexible and responsive to whatever the user wants to discuss."
+}
+
+
 class LiveVoiceService(BaseGeminiService):
     """Service for managing Live API voice conversations with phone call-like experience."""
 
@@ -340,43 +370,15 @@ class LiveVoiceService(BaseGeminiService):
 
     def _get_personalized_system_instruction(self, user_profile: Optional[UserProfile], problem_category: Optional[ProblemCategory]) -> str:
         """Get personalized system instruction for the Live API."""
-        base_instruction = """You are Mitra, a compassionate AI wellness companion specializing in mental health support. 
-
-IMPORTANT GUIDELINES:
-- Respond with natural, conversational audio in a warm, empathetic tone
-- Keep responses concise and engaging (30-60 seconds of speech)
-- Use active listening techniques and validate emotions
-- Ask follow-up questions to encourage deeper sharing
-- Provide gentle guidance and coping strategies when appropriate
-- Be supportive but not prescriptive - you're not replacing professional therapy
-- Use the user's name occasionally to create connection
-- Respond as if this is a live phone conversation
-
-CONVERSATION STYLE:
-- Natural pauses and conversational flow
-- Empathetic acknowledgments ("I hear you", "That sounds difficult")
-- Gentle probing questions to understand better
-- Offer practical wellness techniques when relevant
-- Maintain professional boundaries while being warm and caring"""
+        base_instruction = _LIVE_SYSTEM_INSTRUCTION
 
         if user_profile:
             user_name = user_profile.display_name or "friend"
             mitra_name = user_profile.preferences.mitra_name if user_profile.preferences else "Mitra"
             base_instruction += f"\n\nUser's name: {user_name}\nYour name is: {mitra_name}"
 
-        if problem_category:
-            category_guidance = {
-                ProblemCategory.STRESS_ANXIETY: "Focus on breathing techniques, grounding exercises, and anxiety management strategies.",
-                ProblemCategory.DEPRESSION_SADNESS: "Emphasize emotional validation, gentle encouragement, and mood improvement techniques.",
-                ProblemCategory.RELATIONSHIP_ISSUES: "Focus on communication skills, boundary setting, and relationship dynamics.",
-                ProblemCategory.SELF_ESTEEM: "Emphasize self-compassion, strength identification, and confidence building.",
-                ProblemCategory.GRIEF_LOSS: "Provide gentle support, validation of grief process, and coping strategies.",
-                ProblemCategory.SOCIAL_ANXIETY: "Focus on social confidence building, exposure techniques, and coping strategies.",
-                ProblemCategory.GENERAL_WELLNESS: "Be flexible and responsive to whatever the user wants to discuss."
-            }
-
-            if problem_category in category_guidance:
-                base_instruction += f"\n\nSPECIFIC FOCUS: {category_guidance[problem_category]}"
+        if problem_category and problem_category in _LIVE_CATEGORY_GUIDANCE:
+            base_instruction += f"\n\nSPECIFIC FOCUS: {_LIVE_CATEGORY_GUIDANCE[problem_category]}"
 
         return base_instruction
 
@@ -5,8 +5,9 @@ Integrates with MCP tools to fetch latest documentation and generate contextual
 
 import logging
 import asyncio
+import re
 import uuid
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Pattern, Set, Tuple
 from datetime import datetime
 
 from models.user import ProblemCategory, UserProfile
@@ -15,6 +16,42 @@ from models.wellness import GeneratedResource, ResourceType
 logger = logging.getLogger(__name__)
 
 
+# Common technical keywords that students and professionals might mention
+_TECH_PATTERNS: Dict[str, List[str]] = {
+    'flutter': ['flutter', 'dart', 'widget', 'app development'],
+    'python': ['python', 'django', 'fastapi', 'pandas', 'numpy'],
+    'javascript': ['javascript', 'react', 'node.js', 'npm', 'js'],
+    'react': ['react', 'jsx', 'component', 'hooks', 'state'],
+    'django': ['django', 'python web', 'backend'],
+    'machine_learning': ['ml', 'machine learning', 'ai', 'model training'],
+    'web_development': ['html', 'css', 'frontend', 'backend', 'api'],
+    'mobile_development': ['android', 'ios', 'mobile app'],
+    'data_science': ['data science', 'analytics', 'visualization'],
+    'programming': ['coding', 'programming', 'algorithm', 'debugging']
+}
+
+
+def _compile_tech_phrases() -> Tuple[Dict[str, Set[str]], Pattern[str]]:
+    """Map each phrase to its topics and compile all phrases into one whole-word pattern."""
+    phrase_topics: Dict[str, Set[str]] = {}
+    for topic, phrases in _TECH_PATTERNS.items():
+        for phrase in phrases:
+            phrase_topics.setdefault(phrase, set()).add(topic)
+
+    # The scan reports the longest phrase at each position, so a phrase also
+    # carries the topics of any shorter phrase inside it ("python web" -> python)
+    for phrase, topics in phrase_topics.items():
+        for other, other_topics in list(phrase_topics.items()):
+            if other != phrase and re.search(r"\b" + re.escape(other) + r"\b", phrase):
+                topics |= other_topics
+
+    alternation = "|".join(re.escape(phrase) for phrase in sorted(phrase_topics, key=len, reverse=True))
+    return phrase_topics, re.compile(r"\b(?:" + alternation + r")\b", re.IGNORECASE)
+
+
+_TECH_PHRASE_TOPICS, _TECH_PHRASE_RE = _compile_tech_phrases()
+
+
 class MCPIntegrationService:
     """Service for integrating MCP tools to enhance resource generation."""
 
@@ -43,21 +80,21 @@ class MCPIntegrationService:
             # Detect if user mentioned any technical topics or libraries
             tech_keywords = await self._detect_technical_content(session_context)
 
-            resources = []
+            if not tech_keywords:
+                return []
 
-            if tech_keywords:
-                # Generate tech-specific resources
-                for keyword in tech_keywords[:2]:  # Limit to 2 to avoid overwhelming
-                    resource = await self._generate_tech_resource(
-                        keyword=keyword,
-                        context=session_context,
-                        user_profile=user_profile,
-                        problem_category=problem_category
-                    )
-                    if resource:
-                        resources.append(resource)
+            # Generate tech-specific resources concurrently
+            generated = await asyncio.gather(*[
+                self._generate_tech_resource(
+                    keyword=keyword,
+                    context=session_context,
+                    user_profile=user_profile,
+                    problem_category=problem_category
+                )
+                for keyword in tech_keywords[:2]  # Limit to 2 to avoid overwhelming
+            ])
 
-            return resources
+            return [resource for resource in generated if resource]
 
         except Exception as e:
             logger.error(f"Error generating tech resources: {e}")
@@ -73,30 +110,12 @@ class MCPIntegrationService:
         Returns:
             List of detected technical keywords
         """
-        # Common technical keywords that students and professionals might mention
-        tech_patterns = {
-            'flutter': ['flutter', 'dart', 'widget', 'app development'],
-            'python': ['python', 'django', 'fastapi', 'pandas', 'numpy'],
-            'javascript': ['javascript', 'react', 'node.js', 'npm', 'js'],
-            'react': ['react', 'jsx', 'component', 'hooks', 'state'],
-            'django': ['django', 'python web', 'backend'],
-            'machine_learning': ['ml', 'machine learning', 'ai', 'model training'],
-            'web_development': ['html', 'css', 'frontend', 'backend', 'api'],
-            'mobile_development': ['android', 'ios', 'mobile app'],
-            'data_science': ['data science', 'analytics', 'visualization'],
-            'programming': ['coding', 'programming', 'algorithm', 'debugging']
-        }
-
-        detected_keywords = []
-        context_lower = session_context.lower()
-
-        for main_keyword, patterns in tech_patterns.items():
-            for pattern in patterns:
-                if pattern in context_lower:
-                    detected_keywords.append(main_keyword)
-                    break
+        # One scan over the text finds every phrase, each mapped to the topics it signals
+        detected_keywords = set()
+        for match in _TECH_PHRASE_RE.finditer(session_context):
+            detected_keywords.update(_TECH_PHRASE_TOPICS[match.group(0).lower()])
 
-        return list(set(detected_keywords))  # Remove duplicates
+        return list(detected_keywords)
 
     async def _generate_tech_resource(
         self,
@@ -3,11 +3,14 @@ Resource generation service for Mitra AI.
 Generates helpful resources based on chat session analysis using MCP tools for latest documentation.
 """
 
+import asyncio
 import logging
-import json
+import uuid
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+import orjson
+
 from models.user import ProblemCategory, UserProfile
 from models.wellness import GeneratedResource, ResourceType
 from services.base_gemini_service import BaseGeminiService
@@ -15,6 +18,28 @@ from services.base_gemini_service import BaseGeminiService
 logger = logging.getLogger(__name__)
 
 
+# Response schema for a single generated resource
+_RESOURCE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "description": {"type": "string"},
+        "content": {"type": "string"},
+        "duration_minutes": {"type": "integer"},
+        "difficulty_level": {
+            "type": "string",
+            "enum": ["beginner", "intermediate", "advanced"]
+        },
+        "tags": {
+            "type": "array",
+            "items": {"type": "string"},
+            "maxItems": 5
+        }
+    },
+    "required": ["title", "description", "content", "difficulty_level", "tags"]
+}
+
+
 class ResourceGenerationService(BaseGeminiService):
     """Service for generating contextual resources based on chat analysis."""
 
@@ -44,20 +69,18 @@ class ResourceGenerationService(BaseGeminiService):
             if resource_types is None:
                 resource_types = self._get_default_resource_types(problem_category)
 
-            resources = []
-
-            for resource_type in resource_types[:max_resources]:
-                resource = await self._generate_specific_resource(
+            # Resources are independent, so generate them concurrently
+            generated = await asyncio.gather(*[
+                self._generate_specific_resource(
                     resource_type=resource_type,
                     problem_category=problem_category,
                     user_profile=user_profile,
                     session_context=session_context
                 )
+                for resource_type in resource_types[:max_resources]
+            ])
 
-                if resource:
-                    resources.append(resource)
-
-            return resources
+            return [resource for resource in generated if resource]
 
         except Exception as e:
             logger.error(f"Error generating session resources: {e}")
@@ -117,31 +140,14 @@ class ResourceGenerationService(BaseGeminiService):
             )
 
             # Use structured output to generate the resource
-            schema = {
-                "type": "object",
-                "properties": {
-                    "title": {"type": "string"},
-                    "description": {"type": "string"},
-                    "content": {"type": "string"},
-                    "duration_minutes": {"type": "integer"},
-                    "difficulty_level": {
-                        "type": "string",
-                        "enum": ["beginner", "intermediate", "advanced"]
-                    },
-                    "tags": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    }
-                },
-                "required": ["title", "description", "content", "difficulty_level", "tags"]
-            }
+            schema = _RESOURCE_SCHEMA
 
             # Generate structured content using Gemini
             response = await self.generate_structured_content(prompt, schema)
 
             # Create GeneratedResource object
             resource = GeneratedResource(
-                id=f"resource_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{resource_type}",
+                id=str(uuid.uuid4()),
                 type=resource_type,
                 title=response["title"],
                 description=response["description"],
@@ -291,8 +297,8 @@ Make it culturally appropriate for Indian users.
             prompt = f"""
 Based on the following user patterns, provide personalized wellness insights:
 
-Mood Patterns: {json.dumps(mood_patterns, indent=2)}
-Chat Patterns: {json.dumps(chat_patterns, indent=2)}
+Mood Patterns: {orjson.dumps(mood_patterns, option=orjson.OPT_INDENT_2).decode()}
+Chat Patterns: {orjson.dumps(chat_patterns, option=orjson.OPT_INDENT_2).decode()}
 
 Generate insights that include:
 1. Key patterns observed
@@ -21,6 +21,41 @@ class CrisisSeverity(str, Enum):
     SEVERE = "severe"
 
 
+# High-risk patterns (immediate intervention needed)
+_HIGH_RISK_PATTERNS = [
+    r'\b(?:want|going|plan)(?:ing)?\s+to\s+(?:kill|hurt|harm)\s+(?:myself|me)\b',
+    r'\b(?:suicide|kill myself|end (?:my )?life|no (?:point|reason) (?:to )?liv(?:e|ing))\b',
+    r'\beveryone would be better (?:off )?without me\b',
+    r'\b(?:cutting|burning|hurting) myself\b',
+    r'\b(?:आत्महत्या|खुद को मारना|जान देना|मरना चाहता)\b',  # Hindi terms
+]
+
+# Medium-risk patterns (need support and monitoring)
+_MEDIUM_RISK_PATTERNS = [
+    r'\b(?:can\'?t take it|don\'?t want to be here|nothing matters|no hope)\b',
+    r'\b(?:tired of|sick of) (?:everything|life|living|trying)\b',
+    r'\b(?:nobody|no one) (?:cares|loves|understands) (?:about )?me\b',
+    r'\b(?:feel(?:ing)?|am) (?:so )?(?:hopeless|worthless|useless|empty)\b',
+    r'\b(?:नहीं रह सकता|कोई परवाह नहीं|मरना बेहतर)\b',  # Hindi terms
+]
+
+# Low-risk patterns (general distress, needs gentle support)
+_LOW_RISK_PATTERNS = [
+    r'\b(?:very )?(?:sad|depressed|down|stressed|anxious|overwhelmed)\b',
+    r'\b(?:having (?:a )?hard time|struggling|difficult|tough)\b',
+    r'\b(?:feel(?:ing)?|am) (?:alone|lonely|isolated|lost)\b',
+    r'\b(?:can\'?t sleep|not eating|losing weight)\b',
+]
+
+# Patterns are compiled once at import; services are constructed per request
+_COMPILED_HIGH_RISK = [re.compile(pattern, re.IGNORECASE) for pattern in _HIGH_RISK_PATTERNS]
+_COMPILED_MEDIUM_RISK = [re.compile(pattern, re.IGNORECASE) for pattern in _MEDIUM_RISK_PATTERNS]
+_COMPILED_LOW_RISK = [re.compile(pattern, re.IGNORECASE) for pattern in _LOW_RISK_PATTERNS]
+
+# Crisis keywords lowercased once for context scanning
+_CRISIS_KEYWORDS_LOWER = tuple(keyword.lower() for keyword in settings.crisis_keywords)
+
+
 class SafetyService:
     """Service for detecting crisis situations and providing appropriate interventions."""
     
@@ -30,41 +65,18 @@ class SafetyService:
         self.helplines = settings.crisis_helplines
         self.confidence_threshold = settings.crisis_confidence_threshold
         
-        # Compile regex patterns for more sophisticated detection
+        # Attach regex patterns for more sophisticated detection
         self._compile_patterns()
 
     def _compile_patterns(self):
-        """Compile regex patterns for crisis detection."""
-        # High-risk patterns (immediate intervention needed)
-        self.high_risk_patterns = [
-            r'\b(?:want|going|plan)(?:ing)?\s+to\s+(?:kill|hurt|harm)\s+(?:myself|me)\b',
-            r'\b(?:suicide|kill myself|end (?:my )?life|no (?:point|reason) (?:to )?liv(?:e|ing))\b',
-            r'\beveryone would be better (?:off )?without me\b',
-            r'\b(?:cutting|burning|hurting) myself\b',
-            r'\b(?:आत्महत्या|खुद को मारना|जान देना|मरना चाहता)\b',  # Hindi terms
-        ]
-        
-        # Medium-risk patterns (need support and monitoring)
-        self.medium_risk_patterns = [
-            r'\b(?:can\'?t take it|don\'?t want to be here|nothing matters|no hope)\b',
-            r'\b(?:tired of|sick of) (?:everything|life|living|trying)\b',
-            r'\b(?:nobody|no one) (?:cares|loves|understands) (?:about )?me\b',
-            r'\b(?:feel(?:ing)?|am) (?:so )?(?:hopeless|worthless|useless|empty)\b',
-            r'\b(?:नहीं रह सकता|कोई परवाह नहीं|मरना बेहतर)\b',  # Hindi terms
-        ]
-        
-        # Low-risk patterns (general distress, needs gentle support)
-        self.low_risk_patterns = [
-            r'\b(?:very )?(?:sad|depressed|down|stressed|anxious|overwhelmed)\b',
-            r'\b(?:having (?:a )?hard time|struggling|difficult|tough)\b',
-            r'\b(?:feel(?:ing)?|am) (?:alone|lonely|isolated|lost)\b',
-            r'\b(?:can\'?t sleep|not eating|losing weight)\b',
-        ]
-        
-        # Compile patterns
-        self.compiled_high_risk = [re.compile(pattern, re.IGNORECASE) for pattern in self.high_risk_patterns]
-        self.compiled_medium_risk = [re.compile(pattern, re.IGNORECASE) for pattern in self.medium_risk_patterns]
-        self.compiled_low_risk = [re.compile(pattern, re.IGNORECASE) for pattern in self.low_risk_patterns]
+        """Attach the crisis detection patterns precompiled at import time."""
+        self.high_risk_patterns = _HIGH_RISK_PATTERNS
+        self.medium_risk_patterns = _MEDIUM_RISK_PATTERNS
+        self.low_risk_patterns = _LOW_RISK_PATTERNS
+        
+        self.compiled_high_risk = _COMPILED_HIGH_RISK
+        self.compiled_medium_risk = _COMPILED_MEDIUM_RISK
+        self.compiled_low_risk = _COMPILED_LOW_RISK
 
     async def assess_safety(self, message: str, conversation_history: Optional[List[ChatMessage]] = None) -> Tuple[SafetyStatus, float, Optional[CrisisSeverity]]:
         """
@@ -113,8 +125,6 @@ class SafetyService:
 
     def _analyze_message_risk(self, message: str) -> Tuple[float, Optional[CrisisSeverity]]:
         """Analyze risk level of a single message."""
-        message_lower = message.lower()
-        
         # Check for high-risk patterns
         high_risk_matches = sum(1 for pattern in self.compiled_high_risk if pattern.search(message))
         if high_risk_matches > 0:
@@ -140,14 +150,20 @@ class SafetyService:
         risk_indicators = 0
         total_messages = len(messages)
         
-        # Look for escalating negative sentiment
-        user_messages = [msg for msg in messages[-10:] if msg.role.value == "user"]
-        
-        for i, message in enumerate(user_messages):
+        # Look for escalating negative sentiment in the last 10 messages,
+        # indexing in place rather than slicing and filtering into new lists
+        user_index = 0
+        for position in range(max(0, total_messages - 10), total_messages):
+            message = messages[position]
+            if message.role.value != "user":
+                continue
+            i = user_index
+            user_index += 1
+            
             if message.content.text:
-                # Check for repeated crisis keywords
-                crisis_count = sum(1 for keyword in self.crisis_keywords 
-                                 if keyword.lower() in message.content.text.lower())
+                # Check for repeated crisis keywords; lowercase the text once, not per keyword
+                text_lower = message.content.text.lower()
+                crisis_count = sum(1 for keyword in _CRISIS_KEYWORDS_LOWER if keyword in text_lower)
                 if crisis_count > 0:
                     risk_indicators += crisis_count * (1 + i * 0.1)  # Weight recent messages more
         
@@ -3,11 +3,11 @@ Text generation service for Mitra AI.
 Handles text responses, structured content, and grounding.
 """
 
-import asyncio
 import logging
-import json
-from typing import Optional, List, Dict, Any, Tuple
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator, Union
 
+import orjson
 from google.genai import types
 
 from .base_gemini_service import BaseGeminiService
@@ -19,9 +19,116 @@ from models.user import UserProfile, ProblemCategory
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=64)
+def _compile_schema(schema_key: bytes) -> Union[types.Schema, Dict[str, Any]]:
+    """
+    Validate a response schema into a types.Schema once per distinct schema.
+    
+    Args:
+        schema_key: Schema serialized with sorted keys, so equal schemas share an entry
+        
+    Returns:
+        Prebuilt Schema, or the plain dict if the SDK model cannot describe it
+    """
+    schema = orjson.loads(schema_key)
+    try:
+        return types.Schema.model_validate(schema)
+    except ValueError:
+        return schema
+
+
 class TextGenerationService(BaseGeminiService):
     """Service for text generation and structured content."""
 
+    async def _prepare_text_request(
+        self,
+        messages: List[ChatMessage],
+        user_profile: Optional[UserProfile],
+        problem_category: Optional[ProblemCategory],
+        config: Optional[GenerationConfig],
+        include_grounding: bool
+    ) -> Dict[str, Any]:
+        """Build generate_content arguments for a personalized chat turn."""
+        # Get personalized system instruction
+        system_instruction = self.get_personalized_system_instruction(user_profile, problem_category)
+        
+        # Convert messages to Gemini format
+        gemini_messages = self._convert_messages_to_gemini_format(messages)
+        
+        # Prepare tools
+        tools = []
+        if include_grounding:
+            tools.append(types.Tool(google_search=types.GoogleSearch()))
+        
+        # Prepare generation config
+        gen_config = self._prepare_generation_config(config)
+        
+        # Cached content cannot be combined with tools, so grounded calls send the instruction inline
+        if tools:
+            generation_config = types.GenerateContentConfig(
+                system_instruction=system_instruction,
+                tools=tools,
+                **gen_config
+            )
+        else:
+            generation_config = await self.get_generation_config(
+                system_instruction, settings.gemini_text_model, **gen_config
+            )
+        
+        return {
+            "model": settings.gemini_text_model,
+            "contents": gemini_messages,
+            "config": generation_config
+        }
+
+    async def stream_text_response(
+        self,
+        messages: List[ChatMessage],
+        user_profile: Optional[UserProfile] = None,
+        problem_category: Optional[ProblemCategory] = None,
+        config: Optional[GenerationConfig] = None,
+        include_grounding: bool = False
+    ) -> AsyncIterator[Tuple[str, Optional[List[GroundingSource]]]]:
+        """
+        Stream a personalized text response as it is generated.
+        
+        Chunks that arrive together are joined into one piece of text, so a
+        fast burst costs the caller a single write instead of one per chunk.
+        
+        Args:
+            messages: Conversation history
+            user_profile: User profile for personalization
+            problem_category: Current session problem category
+            config: Generation configuration
+            include_grounding: Whether to use Google Search grounding
+            
+        Yields:
+            (text, None) for each response piece in order, then ("", grounding_sources)
+            once at the end if the response was grounded
+        """
+        try:
+            request = await self._prepare_text_request(
+                messages, user_profile, problem_category, config, include_grounding
+            )
+            grounding_metadata = None
+            
+            async for chunks in self.generate_content_stream(**request):
+                text = "".join(chunk.text for chunk in chunks if chunk.text)
+                if text:
+                    yield text, None
+                
+                # Grounding arrives with the final chunks; keep the latest and convert it once
+                for chunk in chunks:
+                    if chunk.candidates and getattr(chunk.candidates[0], 'grounding_metadata', None):
+                        grounding_metadata = chunk.candidates[0].grounding_metadata
+            
+            if grounding_metadata:
+                yield "", self._extract_grounding_sources(grounding_metadata)
+                    
+        except Exception as e:
+            logger.error(f"Error streaming text response: {e}")
+            raise
+
     async def generate_text_response(
         self,
         messages: List[ChatMessage],
@@ -44,48 +151,33 @@ class TextGenerationService(BaseGeminiService):
             Tuple of (response_text, grounding_sources, thinking_text)
         """
         try:
-            # Get personalized system instruction
-            system_instruction = self.get_personalized_system_instruction(user_profile, problem_category)
-            
-            # Convert messages to Gemini format
-            gemini_messages = self._convert_messages_to_gemini_format(messages)
-            
-            # Prepare tools
-            tools = []
-            if include_grounding:
-                tools.append(types.Tool(google_search=types.GoogleSearch()))
-            
-            # Prepare generation config
-            gen_config = self._prepare_generation_config(config)
-            
-            # Generate response
-            response = await asyncio.to_thread(
-                self.client.models.generate_content,
-                model=settings.gemini_text_model,
-                contents=gemini_messages,
-                config=types.GenerateContentConfig(
-                    system_instruction=system_instruction,
-                    tools=tools if tools else None,
-                    **gen_config
-                )
+            request = await self._prepare_text_request(
+                messages, user_profile, problem_category, config, include_grounding
             )
             
-            # Extract response components
-            response_text = response.text if response.text else ""
+            # Consume the stream into a single response
+            text_parts = []
             thinking_text = None
             grounding_sources = None
             
-            # Extract thinking if available (Gemini 2.5)
-            if hasattr(response, 'candidates') and response.candidates:
-                candidate = response.candidates[0]
-                if hasattr(candidate, 'thinking') and candidate.thinking:
-                    thinking_text = candidate.thinking
-                
-                # Extract grounding metadata if available
-                if hasattr(candidate, 'grounding_metadata') and candidate.grounding_metadata:
-                    grounding_sources = self._extract_grounding_sources(candidate.grounding_metadata)
+            async for chunks in self.generate_content_stream(**request):
+                for chunk in chunks:
+                    if chunk.text:
+                        text_parts.append(chunk.text)
+                    
+                    if not (hasattr(chunk, 'candidates') and chunk.candidates):
+                        continue
+                    candidate = chunk.candidates[0]
+                    
+                    # Extract thinking if available (Gemini 2.5)
+                    if hasattr(candidate, 'thinking') and candidate.thinking:
+                        thinking_text = candidate.thinking
+                    
+                    # Grounding metadata arrives with the final chunks
+                    if hasattr(candidate, 'grounding_metadata') and candidate.grounding_metadata:
+                        grounding_sources = self._extract_grounding_sources(candidate.grounding_metadata)
             
-            return response_text, grounding_sources, thinking_text
+            return "".join(text_parts), grounding_sources, thinking_text
             
         except Exception as e:
             logger.error(f"Error generating text response: {e}")
@@ -125,23 +217,24 @@ class TextGenerationService(BaseGeminiService):
         try:
             # Get base system instruction for structured content
             system_instruction = self.get_personalized_system_instruction()
-
-            response = await asyncio.to_thread(
-                self.client.models.generate_content,
+            response = await self.generate_content(
                 model=settings.gemini_text_model,
                 contents=[prompt],
-                config=types.GenerateContentConfig(
-                    system_instruction=system_instruction,
-                    response_schema=schema
+                config=await self.get_generation_config(
+                    system_instruction,
+                    settings.gemini_text_model,
+                    response_mime_type="application/json",
+                    response_schema=_compile_schema(orjson.dumps(schema, option=orjson.OPT_SORT_KEYS))
                 )
             )
             
             # Parse structured response
-            if hasattr(response, 'parsed') and response.parsed:
-                return response.parsed
-            else:
-                # Fallback to parsing text response as JSON
-                return json.loads(response.text)
+            parsed = getattr(response, 'parsed', None)
+            if parsed:
+                return parsed
+            
+            # Fallback to parsing text response as JSON
+            return orjson.loads(response.text)
             
         except Exception as e:
             logger.error(f"Error generating structured content: {e}")
@@ -3,9 +3,8 @@ Voice processing service for Mitra AI.
 Handles voice input/output and Live API interactions.
 """
 
-import asyncio
 import logging
-from typing import List, Tuple, Optional, Dict
+from typing import List, Tuple, Optional, Dict, AsyncIterator
 
 from google.genai import types
 
@@ -20,16 +19,16 @@ logger = logging.getLogger(__name__)
 class VoiceService(BaseGeminiService):
     """Service for voice processing and Live API interactions."""
 
-    async def generate_voice_response(
+    async def stream_voice_response(
         self,
         messages: List[ChatMessage],
         user_profile: Optional[UserProfile] = None,
         problem_category: Optional[ProblemCategory] = None,
         voice: Optional[str] = None,
         language: str = "en"
-    ) -> Tuple[bytes, Optional[str]]:
+    ) -> AsyncIterator[Tuple[bytes, Optional[str]]]:
         """
-        Generate personalized voice response using Gemini Live API.
+        Stream a personalized voice response from the Gemini Live API as it is generated.
         
         Args:
             messages: Conversation history
@@ -38,8 +37,8 @@ class VoiceService(BaseGeminiService):
             voice: Voice to use (overrides user preference)
             language: Language code
             
-        Returns:
-            Tuple of (audio_data, transcription)
+        Yields:
+            (audio_chunk, None) for each audio frame and (b"", text) for transcription text
         """
         try:
             # Determine voice from user preferences or default
@@ -87,26 +86,54 @@ class VoiceService(BaseGeminiService):
                     turn_complete=True
                 )
                 
-                # Collect audio response
-                audio_chunks = []
-                transcription = None
-                
+                # Forward each frame as soon as it arrives
                 async for message in session.receive():
                     if hasattr(message, 'server_content'):
                         for part in message.server_content.parts:
                             if hasattr(part, 'inline_data') and part.inline_data:
-                                audio_chunks.append(part.inline_data.data)
+                                yield part.inline_data.data, None
                             elif hasattr(part, 'text') and part.text:
-                                transcription = part.text
-                
-                # Combine audio chunks
-                audio_data = b''.join(audio_chunks) if audio_chunks else b''
-                return audio_data, transcription
+                                yield b'', part.text
                 
         except Exception as e:
-            logger.error(f"Error generating voice response: {e}")
+            logger.error(f"Error streaming voice response: {e}")
             raise
 
+    async def generate_voice_response(
+        self,
+        messages: List[ChatMessage],
+        user_profile: Optional[UserProfile] = None,
+        problem_category: Optional[ProblemCategory] = None,
+        voice: Optional[str] = None,
+        language: str = "en"
+    ) -> Tuple[bytes, Optional[str]]:
+        """
+        Generate personalized voice response using Gemini Live API.
+        
+        Args:
+            messages: Conversation history
+            user_profile: User profile for personalization
+            problem_category: Current session problem category
+            voice: Voice to use (overrides user preference)
+            language: Language code
+            
+        Returns:
+            Tuple of (audio_data, transcription)
+        """
+        # Append frames into one growing buffer so each chunk can be freed as it arrives
+        audio_buf = bytearray()
+        transcription = None
+        
+        async for audio_chunk, text in self.stream_voice_response(
+            messages, user_profile, problem_category, voice, language
+        ):
+            if audio_chunk:
+                audio_buf.extend(audio_chunk)
+            if text:
+                transcription = text
+        
+        return bytes(audio_buf), transcription
+
     async def process_voice_input(
         self,
         audio_data: bytes,
@@ -146,14 +173,14 @@ class VoiceService(BaseGeminiService):
                 )
                 
                 # Receive transcription
-                transcription = ""
+                transcription_parts = []
                 async for message in session.receive():
                     if hasattr(message, 'server_content'):
                         for part in message.server_content.parts:
                             if hasattr(part, 'text') and part.text:
-                                transcription += part.text
+                                transcription_parts.append(part.text)
                 
-                return transcription.strip()
+                return "".join(transcription_parts).strip()
                 
         except Exception as e:
             logger.error(f"Error processing voice input: {e}")
@@ -7,7 +7,7 @@ import asyncio
 import logging
 from typing import Dict, Any, Optional, List
 
-from google.genai import types
+import orjson
 
 from .base_gemini_service import BaseGeminiService
 from .text_generation_service import TextGenerationService
@@ -17,6 +17,148 @@ from models.chat import ResourceType, GeneratedResource
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for schema-constrained insights before falling back to the draft
+INSIGHT_STRUCTURED_TIMEOUT = 8.0
+
+
+# Response schema for wellness insights
+_WELLNESS_INSIGHT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "patterns": {
+            "type": "array",
+            "items": {"type": "string"},
+            "maxItems": 5
+        },
+        "recommendations": {
+            "type": "array",
+            "items": {"type": "string"},
+            "maxItems": 5
+        },
+        "positive_observations": {
+            "type": "array",
+            "items": {"type": "string"},
+            "maxItems": 5
+        },
+        "improvement_suggestions": {
+            "type": "array",
+            "items": {"type": "string"},
+            "maxItems": 5
+        },
+        "overall_assessment": {"type": "string"}
+    },
+    "required": ["patterns", "recommendations", "positive_observations"]
+}
+
+# Returned when neither the structured call nor the draft yields a usable insight
+_DEFAULT_WELLNESS_INSIGHT: Dict[str, Any] = {
+    "patterns": [],
+    "recommendations": [
+        "Keep logging your mood daily so patterns become easier to spot",
+        "Take a few minutes each day for a short breathing or mindfulness break"
+    ],
+    "positive_observations": ["You are taking time to check in with yourself, which is a great step"]
+}
+
+
+def _coerce_to_schema(data: Dict[str, Any], schema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Coerce a schema-free JSON draft to a flat object response schema.
+    
+    Unknown keys are dropped, string arrays are trimmed to maxItems and a single
+    string is accepted where an array is expected.
+    
+    Args:
+        data: Parsed draft object
+        schema: Object schema with string and string-array properties
+        
+    Returns:
+        Object matching the schema, or None if a required field is missing or has the wrong type
+    """
+    result = {}
+    for key, spec in schema["properties"].items():
+        value = data.get(key)
+        if value is None:
+            continue
+        if spec["type"] == "array":
+            if isinstance(value, str):
+                value = [value]
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                return None
+            value = value[:spec.get("maxItems", len(value))]
+        elif not isinstance(value, str):
+            return None
+        result[key] = value
+    
+    if any(key not in result for key in schema.get("required", [])):
+        return None
+    return result
+
+
+# Response schema for coping strategies
+_COPING_STRATEGY_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "immediate_strategies": {
+            "type": "array",
+            "items": {"type": "string"},
+            "maxItems": 5,
+            "description": "Quick techniques to use right now"
+        },
+        "breathing_exercises": {
+            "type": "array",
+            "items": {"type": "string"},
+            "maxItems": 5,
+            "description": "Simple breathing techniques"
+        },
+        "cognitive_techniques": {
+            "type": "array",
+            "items": {"type": "string"},
+            "maxItems": 5,
+            "description": "Thought reframing strategies"
+        },
+        "physical_activities": {
+            "type": "array",
+            "items": {"type": "string"},
+            "maxItems": 5,
+            "description": "Gentle physical activities"
+        },
+        "social_support": {
+            "type": "array",
+            "items": {"type": "string"},
+            "maxItems": 5,
+            "description": "Ways to connect with others appropriately"
+        },
+        "encouragement": {"type": "string"}
+    },
+    "required": ["immediate_strategies", "encouragement"]
+}
+
+# Response schema for mood check-ins
+_MOOD_CHECK_IN_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "opening_message": {"type": "string"},
+        "mood_questions": {
+            "type": "array",
+            "items": {"type": "string"},
+            "maxItems": 5
+        },
+        "reflection_prompts": {
+            "type": "array",
+            "items": {"type": "string"},
+            "maxItems": 5
+        },
+        "encouragement": {"type": "string"},
+        "follow_up_options": {
+            "type": "array",
+            "items": {"type": "string"},
+            "maxItems": 5
+        }
+    },
+    "required": ["opening_message", "mood_questions", "encouragement"]
+}
+
 
 class WellnessService(BaseGeminiService):
     """Service for wellness-specific functionality."""
@@ -30,7 +172,8 @@ class WellnessService(BaseGeminiService):
         self,
         meditation_type: str,
         duration_minutes: int,
-        focus_area: Optional[str] = None
+        focus_area: Optional[str] = None,
+        user_profile: Optional[UserProfile] = None
     ) -> str:
         """
         Generate a custom meditation script.
@@ -39,6 +182,7 @@ class WellnessService(BaseGeminiService):
             meditation_type: Type of meditation
             duration_minutes: Duration in minutes
             focus_area: Specific focus area if any
+            user_profile: User profile for personalization
             
         Returns:
             Generated meditation script
@@ -59,12 +203,12 @@ class WellnessService(BaseGeminiService):
             Format as a gentle, step-by-step guide with timing markers.
             """
             
-            response = await asyncio.to_thread(
-                self.client.models.generate_content,
+            response = await self.generate_content(
                 model=settings.gemini_text_model,
                 contents=[prompt],
-                config=types.GenerateContentConfig(
-                    system_instruction=self.system_instruction,
+                config=await self.get_generation_config(
+                    self.get_personalized_system_instruction(user_profile),
+                    settings.gemini_text_model,
                     temperature=0.7
                 )
             )
@@ -77,13 +221,18 @@ class WellnessService(BaseGeminiService):
 
     async def generate_wellness_insight(
         self,
-        user_data: Dict[str, Any]
+        user_data: Dict[str, Any],
+        strict: bool = True
     ) -> Dict[str, Any]:
         """
         Generate personalized wellness insights based on user data.
         
         Args:
             user_data: User's wellness data (mood, journal entries, etc.)
+            strict: Only accept schema-constrained output. When False, a free-form
+                JSON draft runs alongside and is used if the structured call fails
+                or exceeds INSIGHT_STRUCTURED_TIMEOUT; a draft that does not match
+                the schema is replaced by a generic default insight.
             
         Returns:
             Structured wellness insight
@@ -103,36 +252,56 @@ class WellnessService(BaseGeminiService):
             Keep it positive, supportive, and culturally appropriate for Indian youth.
             """
             
-            schema = {
-                "type": "object",
-                "properties": {
-                    "patterns": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "recommendations": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "positive_observations": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "improvement_suggestions": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "overall_assessment": {"type": "string"}
-                },
-                "required": ["patterns", "recommendations", "positive_observations"]
-            }
-            
-            return await self.text_service.generate_structured_content(prompt, schema)
+            schema = _WELLNESS_INSIGHT_SCHEMA
+            
+            if strict:
+                return await self.text_service.generate_structured_content(prompt, schema)
+            
+            # Speculatively draft without the schema while the constrained call runs
+            structured_task = asyncio.create_task(self.text_service.generate_structured_content(prompt, schema))
+            draft_task = asyncio.create_task(self._draft_json(prompt, list(schema["properties"])))
+            try:
+                return await asyncio.wait_for(structured_task, timeout=INSIGHT_STRUCTURED_TIMEOUT)
+            except Exception as e:
+                logger.warning(f"Structured wellness insight unavailable, using draft: {e}")
+                draft = await draft_task
+                insight = _coerce_to_schema(draft, schema) if draft is not None else None
+                if insight is None:
+                    logger.warning("Wellness insight draft unusable, using default insight")
+                    return {key: list(value) for key, value in _DEFAULT_WELLNESS_INSIGHT.items()}
+                return insight
+            finally:
+                draft_task.cancel()
             
         except Exception as e:
             logger.error(f"Error generating wellness insight: {e}")
             raise
 
+    async def _draft_json(self, prompt: str, keys: List[str]) -> Optional[Dict[str, Any]]:
+        """Generate a schema-free JSON answer and parse it leniently, returning None if unusable."""
+        try:
+            response = await self.generate_content(
+                model=settings.gemini_text_model,
+                contents=[f"{prompt}\n\nRespond with a single JSON object using the keys: {', '.join(keys)}."],
+                config=await self.get_generation_config(
+                    self.get_personalized_system_instruction(),
+                    settings.gemini_text_model,
+                    response_mime_type="application/json"
+                )
+            )
+            text = response.text or ""
+            
+            # Tolerate code fences or prose around the object
+            start, end = text.find("{"), text.rfind("}")
+            if start == -1 or end <= start:
+                return None
+            draft = orjson.loads(text[start:end + 1])
+            return draft if isinstance(draft, dict) else None
+            
+        except Exception as e:
+            logger.warning(f"Error drafting JSON content: {e}")
+            return None
+
     async def generate_coping_strategy(
         self,
         emotion: str,
@@ -169,38 +338,7 @@ class WellnessService(BaseGeminiService):
             - Respectful of family and social dynamics
             """
             
-            schema = {
-                "type": "object",
-                "properties": {
-                    "immediate_strategies": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Quick techniques to use right now"
-                    },
-                    "breathing_exercises": {
-                        "type": "array", 
-                        "items": {"type": "string"},
-                        "description": "Simple breathing techniques"
-                    },
-                    "cognitive_techniques": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Thought reframing strategies"
-                    },
-                    "physical_activities": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Gentle physical activities"
-                    },
-                    "social_support": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Ways to connect with others appropriately"
-                    },
-                    "encouragement": {"type": "string"}
-                },
-                "required": ["immediate_strategies", "encouragement"]
-            }
+            schema = _COPING_STRATEGY_SCHEMA
             
             return await self.text_service.generate_structured_content(prompt, schema)
             
@@ -240,26 +378,7 @@ class WellnessService(BaseGeminiService):
             Keep it warm, non-clinical, and like a caring friend checking in.
             """
             
-            schema = {
-                "type": "object",
-                "properties": {
-                    "opening_message": {"type": "string"},
-                    "mood_questions": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "reflection_prompts": {
-                        "type": "array", 
-                        "items": {"type": "string"}
-                    },
-                    "encouragement": {"type": "string"},
-                    "follow_up_options": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    }
-                },
-                "required": ["opening_message", "mood_questions", "encouragement"]
-            }
+            schema = _MOOD_CHECK_IN_SCHEMA
             
             return await self.text_service.generate_structured_content(prompt, schema)
             
@@ -316,7 +435,7 @@ class WellnessService(BaseGeminiService):
             - Practical and actionable
             """
             
-            response = await self.client.models.generate_content(
+            response = await self.generate_content(
                 model=settings.gemini_model,
                 contents=[prompt],
                 config={"system_instruction": system_instruction}
@@ -364,18 +483,17 @@ class WellnessService(BaseGeminiService):
                 }
                 resource_types = resource_mapping.get(problem_category, [ResourceType.COPING_STRATEGIES, ResourceType.AFFIRMATIONS])
             
-            resources = []
             system_instruction = self.get_personalized_system_instruction(user_profile, problem_category)
             mitra_name = user_profile.preferences.mitra_name if user_profile.preferences else "Mitra"
             
-            for resource_type in resource_types[:3]:  # Limit to 3 resources
-                resource = await self._generate_single_resource(
+            # Resources are independent, so generate them concurrently
+            generated = await asyncio.gather(*[
+                self._generate_single_resource(
                     resource_type, problem_category, user_profile, session_context, system_instruction, mitra_name
                 )
-                if resource:
-                    resources.append(resource)
-                    
-            return resources
+                for resource_type in resource_types[:3]  # Limit to 3 resources
+            ])
+            return [resource for resource in generated if resource]
             
         except Exception as e:
             logger.error(f"Error generating session resources: {e}")
@@ -436,23 +554,23 @@ class WellnessService(BaseGeminiService):
             if not prompt:
                 return None
                 
-            response = await self.client.models.generate_content(
-                model=settings.gemini_model,
-                contents=[prompt],
-                config={"system_instruction": system_instruction}
-            )
-            
-            # Generate title and description
+            # Title and description prompts do not depend on the content, so all three run together
             title_prompt = f"Create a short, engaging title for this {resource_type.value} resource about {problem_category.value.replace('_', ' ')}"
-            title_response = await self.client.models.generate_content(
-                model=settings.gemini_model,
-                contents=[title_prompt]
-            )
-            
             desc_prompt = f"Write a brief 1-2 sentence description for this {resource_type.value} resource"
-            desc_response = await self.client.models.generate_content(
-                model=settings.gemini_model,
-                contents=[desc_prompt]
+            response, title_response, desc_response = await asyncio.gather(
+                self.generate_content(
+                    model=settings.gemini_model,
+                    contents=[prompt],
+                    config={"system_instruction": system_instruction}
+                ),
+                self.generate_content(
+                    model=settings.gemini_model,
+                    contents=[title_prompt]
+                ),
+                self.generate_content(
+                    model=settings.gemini_model,
+                    contents=[desc_prompt]
+                )
             )
             
             # Determine duration and difficulty